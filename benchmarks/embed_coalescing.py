@@ -0,0 +1,84 @@
+"""
+Compare embed requests and wall time with and without cross job coalescing.
+
+    python -m benchmarks.embed_coalescing --jobs 50 --chunks 5 40 --latency 0.2
+
+Every job embeds a document of a random size between the --chunks bounds at
+the same time, the way the worker runs concurrent jobs. FakeEmbedder stands
+in for the network with a fixed --latency per request, so nothing is sent.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sliderblend.internal.services.embedders import CoalescingEmbedder, FakeEmbedder
+from sliderblend.pkg import BATCH_SIZE
+
+
+class CountingEmbedder(FakeEmbedder):
+    def __init__(self, latency: float, max_concurrency: int) -> None:
+        super().__init__(latency)
+        self.requests = 0
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def embed_documents(self, texts):
+        # the same per request limit the real client applies, BATCH_SIZE texts
+        vectors = []
+        for i in range(0, len(texts), BATCH_SIZE):
+            async with self._slots:
+                self.requests += 1
+                batch = texts[i : i + BATCH_SIZE]
+                vectors.extend(await super().embed_documents(batch))
+        return vectors
+
+
+async def _run(embedder, documents: list[list[str]]) -> float:
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(embedder.embed_documents(document) for document in documents)
+    )
+    elapsed = time.perf_counter() - start
+    for document, vectors in zip(documents, results):
+        assert len(vectors) == len(document)
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--chunks", type=int, nargs=2, default=[5, 40])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--delay", type=float, nargs="+", default=[0.002, 0.005, 0.02]
+    )
+    args = parser.parse_args()
+
+    documents = [
+        [f"job {job} chunk {i}" for i in range(random.randint(*args.chunks))]
+        for job in range(args.jobs)
+    ]
+    texts = sum(len(document) for document in documents)
+    print(f"{args.jobs} jobs, {texts} chunks, {args.latency * 1000:.0f}ms per request")
+
+    direct = CountingEmbedder(args.latency, args.concurrency)
+    elapsed = await _run(direct, documents)
+    print(f"  {'direct':<22} {direct.requests:>5} requests  {elapsed:>6.2f}s")
+
+    for delay in args.delay:
+        inner = CountingEmbedder(args.latency, args.concurrency)
+        coalesced = CoalescingEmbedder(
+            inner, max_delay=delay, max_concurrency=args.concurrency
+        )
+        elapsed = await _run(coalesced, documents)
+        print(
+            f"  {f'coalesced {delay * 1000:g}ms':<22} "
+            f"{inner.requests:>5} requests  {elapsed:>6.2f}s"
+        )
+        await coalesced.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
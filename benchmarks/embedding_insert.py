@@ -0,0 +1,82 @@
+"""
+Compare rows/sec of the embedding insert paths against the configured database.
+
+    python -m benchmarks.embedding_insert --rows 1500
+
+Everything runs inside a transaction that is rolled back, nothing is kept.
+"""
+
+import argparse
+import random
+import time
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from sliderblend.internal.models import (
+    DocumentEmbeddingsModel,
+    DocumentsModel,
+    UserModel,
+)
+from sliderblend.pkg.db import engine
+
+
+def _make_rows(document_id, count: int) -> list[dict]:
+    return [
+        DocumentEmbeddingsModel(
+            text=f"chunk {i} " * 50,
+            embedding=[random.random() for _ in range(1024)],
+            page_number=i // 5 + 1,
+            document_id=document_id,
+        ).model_dump()
+        for i in range(count)
+    ]
+
+
+def _per_row(rows: list[dict], session: Session) -> None:
+    for row in rows:
+        _, err = DocumentEmbeddingsModel(**row).create(session)
+        if err:
+            raise err
+
+
+def _executemany(rows: list[dict], session: Session) -> None:
+    if err := DocumentEmbeddingsModel.bulk_create(rows, session):
+        raise err
+
+
+def _copy(rows: list[dict], session: Session) -> None:
+    if err := DocumentEmbeddingsModel.copy_create(rows, session):
+        raise err
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1500)
+    args = parser.parse_args()
+
+    for name, method in (
+        ("per-row create", _per_row),
+        ("executemany", _executemany),
+        ("copy binary", _copy),
+    ):
+        with Session(engine) as session:
+            user = UserModel(telegram_user_id=str(uuid4()), first_name="bench")
+            user.create(session)
+            document = DocumentsModel(
+                number_of_pages=1, document_name="bench", size=0, user_id=user.id
+            )
+            document.create(session)
+            rows = _make_rows(document.id, args.rows)
+
+            start = time.perf_counter()
+            method(rows, session)
+            session.flush()
+            elapsed = time.perf_counter() - start
+            session.rollback()
+
+        print(f"{name:<16} {args.rows / elapsed:>10.0f} rows/s ({elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
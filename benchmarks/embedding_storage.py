@@ -0,0 +1,148 @@
+"""
+Compare storage size, insert rate and recall@k of each EMBEDDER_STORAGE option.
+
+    python -m benchmarks.embedding_storage --rows 20000 --queries 50 -k 10
+
+Each variant loads the same random unit vectors, quantized the way the
+embedders do it, into one document through COPY with its hnsw index in
+place, then answers the same queries with the exact scan and the hnsw
+index. Recall is against an exact float32 search in numpy, so the exact
+scan column shows what quantization alone costs. Every variant runs in its
+own transaction that is rolled back, nothing is kept. Needs the halfvec and
+binary storage migration and pgvector >= 0.7.
+"""
+
+import argparse
+import statistics
+import time
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import text
+from sqlmodel import Session
+
+from sliderblend.internal.models import (
+    DocumentEmbeddingsModel,
+    DocumentsModel,
+    UserModel,
+)
+from sliderblend.internal.models.document import EMBEDDING_COLUMNS
+from sliderblend.internal.services.embedders import EMBEDDING_TYPES, quantize
+from sliderblend.internal.services.search import _ann_statement, _exact_statement
+from sliderblend.pkg.db import engine
+
+BATCH = 5000
+
+
+def _unit_vectors(count: int, dims: int = 1024) -> np.ndarray:
+    vectors = np.random.standard_normal((count, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _index_name(storage: str) -> str:
+    return f"ix_document_embeddings_{EMBEDDING_COLUMNS[storage]}_hnsw"
+
+
+def _relation_size(session: Session, name: str) -> int:
+    return session.execute(
+        text("SELECT pg_relation_size(:name)"), {"name": name}
+    ).scalar_one()
+
+
+def _load(session: Session, document_id, vectors: np.ndarray, storage: str) -> float:
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), BATCH):
+        batch = quantize(vectors[offset : offset + BATCH], EMBEDDING_TYPES[storage])
+        rows = [
+            DocumentEmbeddingsModel(
+                text=f"chunk {offset + i}",
+                page_number=1,
+                document_id=document_id,
+                **DocumentEmbeddingsModel.embedding_values(vector, storage),
+            ).model_dump()
+            for i, vector in enumerate(batch)
+        ]
+        if err := DocumentEmbeddingsModel.copy_create(rows, session):
+            raise err
+    return time.perf_counter() - start
+
+
+def _recall(session: Session, build, document_id, queries, truth, k, storage):
+    recalls, latencies = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        rows = session.exec(build(query, document_id, k, storage)).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        recalls.append(len({row.text for row in rows} & expected) / k)
+    return statistics.mean(recalls), statistics.median(latencies)
+
+
+def _bench(session: Session, args, storage: str, vectors, queries, truth) -> None:
+    user = UserModel(telegram_user_id=str(uuid4()), first_name="bench")
+    user.create(session)
+    document = DocumentsModel(
+        number_of_pages=1,
+        document_name=f"bench-{storage}",
+        size=0,
+        user_id=user.id,
+        embedding_storage=storage,
+    )
+    document.create(session)
+
+    index_before = _relation_size(session, _index_name(storage))
+    elapsed = _load(session, document.id, vectors, storage)
+    index_size = _relation_size(session, _index_name(storage)) - index_before
+    session.execute(text("ANALYZE document_embeddings"))
+    column_bytes = session.execute(
+        text(
+            f"SELECT avg(pg_column_size({EMBEDDING_COLUMNS[storage]})) "
+            "FROM document_embeddings WHERE document_id = :id"
+        ),
+        {"id": document.id},
+    ).scalar_one()
+
+    session.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+        {"ef": str(args.ef_search)},
+    )
+    exact, exact_ms = _recall(
+        session, _exact_statement, document.id, queries, truth, args.k, storage
+    )
+    ann, ann_ms = _recall(
+        session, _ann_statement, document.id, queries, truth, args.k, storage
+    )
+    print(
+        f"{storage:<8} {float(column_bytes):>8.0f} B/row  "
+        f"index {index_size / len(vectors):>7.0f} B/row  "
+        f"{len(vectors) / elapsed:>8.0f} rows/s  "
+        f"exact recall@{args.k} {exact:.3f} ({exact_ms:.1f}ms)  "
+        f"hnsw recall@{args.k} {ann:.3f} ({ann_ms:.1f}ms)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, default=100)
+    parser.add_argument(
+        "--storage", nargs="+", default=["vector", "halfvec", "int8", "binary"]
+    )
+    args = parser.parse_args()
+
+    vectors = _unit_vectors(args.rows)
+    picks = vectors[np.random.randint(args.rows, size=args.queries)]
+    queries = picks + _unit_vectors(args.queries) * 0.5
+    nearest = np.argsort(-(queries @ vectors.T), axis=1)[:, : args.k]
+    truth = [{f"chunk {i}" for i in row} for row in nearest.tolist()]
+    queries = queries.tolist()
+
+    for storage in args.storage:
+        with Session(engine) as session:
+            _bench(session, args, storage, vectors, queries, truth)
+            session.rollback()
+
+
+if __name__ == "__main__":
+    main()
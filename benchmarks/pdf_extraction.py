@@ -0,0 +1,74 @@
+"""
+Compare pages/sec of sequential LoadPDF.load against LoadPDF.parallel_load.
+
+    python -m benchmarks.pdf_extraction --pages 50 200 1000 --workers 1 2 4 8
+
+Runs offline, synthetic pdfs of text heavy pages are generated in a temp dir.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+from sliderblend.internal.services.embedding import LoadPDF
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua. "
+)
+
+
+def _make_pdf(path: str, pages: int) -> None:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        rect = page.rect + (36, 36, -36, -36)
+        page.insert_textbox(rect, f"Page {i + 1}\n" + LOREM * 30, fontsize=8)
+    doc.save(path)
+    doc.close()
+
+
+def _report(name: str, pages: int, elapsed: float) -> None:
+    print(f"  {name:<20} {pages / elapsed:>10.0f} pages/s ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"{pages}.pdf")
+            _make_pdf(path, pages)
+            loader = LoadPDF(name=path, source=path)
+            print(f"{pages} pages")
+
+            start = time.perf_counter()
+            expected, _ = loader.load()
+            _report("sequential", pages, time.perf_counter() - start)
+
+            for workers in sorted(set(args.workers)):
+                with ProcessPoolExecutor(workers) as executor:
+                    # warm the pool so process start up is not measured
+                    list(executor.map(abs, range(workers)))
+                    start = time.perf_counter()
+                    docs, err = loader.parallel_load(executor, shards=workers)
+                    elapsed = time.perf_counter() - start
+                if err:
+                    raise err
+                assert [d.page_content for d in docs] == [
+                    d.page_content for d in expected
+                ]
+                _report(f"parallel x{workers}", pages, elapsed)
+
+
+if __name__ == "__main__":
+    main()
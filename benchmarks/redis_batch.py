@@ -0,0 +1,62 @@
+"""
+Compare ops/sec of single key RedisClient calls against the pipelined batch calls.
+
+    python -m benchmarks.redis_batch --items 10000
+
+Uses the configured Redis, keys are written under bench: and removed after.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sliderblend.internal.redis import RedisClient
+from sliderblend.pkg import RedisSettings
+
+
+def _report(name: str, count: int, elapsed: float) -> None:
+    print(f"{name:<28} {count / elapsed:>10.0f} ops/s ({elapsed:.2f}s)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    client = RedisClient(RedisSettings())
+    items = {
+        f"bench:{i}": {"id": i, "name": f"user {i}", "active": True}
+        for i in range(args.items)
+    }
+    keys = list(items)
+
+    start = time.perf_counter()
+    for key, data in items.items():
+        await client.create(key, data)
+    _report("create (single)", len(items), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        await client.get(key)
+    _report("get (single)", len(keys), time.perf_counter() - start)
+
+    for transaction in (False, True):
+        start = time.perf_counter()
+        await client.batch_create(
+            items, transaction=transaction, chunk_size=args.chunk_size
+        )
+        name = f"batch_create (transaction={transaction})"
+        _report(name, len(items), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await client.get_many(keys, chunk_size=args.chunk_size)
+    _report("get_many", len(keys), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await client.delete_many(keys, chunk_size=args.chunk_size)
+    _report("delete_many", len(keys), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""
+Encode/decode cost and payload size of the RedisClient codecs.
+
+    python -m benchmarks.redis_codecs --rounds 20000
+
+Runs offline, nothing is sent to Redis.
+"""
+
+import argparse
+import time
+from uuid import uuid4
+
+from sliderblend.internal.codecs import JsonCodec, OrjsonCodec
+from sliderblend.internal.schemas import UserCache
+from sliderblend.pkg.types import Job
+
+
+def _samples() -> list[tuple[str, object, type]]:
+    job = Job(metadata={"document_id": uuid4(), "file_key": "user:1/document:a.pdf"})
+    user = UserCache(
+        id=uuid4(),
+        telegram_username="someone",
+        telegram_user_id="123456789",
+        first_name="Some",
+        last_name="One",
+        email=None,
+        is_active=True,
+    )
+    return [("Job", job, Job), ("UserCache", user, UserCache)]
+
+
+def _time(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'':<22} {'encode us':>10} {'decode us':>10} {'bytes':>6}")
+    for name, obj, object_class in _samples():
+        for codec in (JsonCodec(), OrjsonCodec()):
+            payload = codec.encode(obj)
+            encode = _time(lambda: codec.encode(obj), args.rounds)
+            decode = _time(lambda: codec.decode(payload, object_class), args.rounds)
+            label = f"{name} {type(codec).__name__}"
+            print(
+                f"{label:<22} {encode:>10.2f} {decode:>10.2f} "
+                f"{len(payload.encode()):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Compare document scoped search strategies as the embeddings table grows.
+
+    python -m benchmarks.scoped_search --rows 10000 1000000 10000000 \\
+        --small-chunks 200 --large-chunks 20000 --filler-chunks 500
+
+For every table size one small and one large target document are written
+among filler documents, then each target is searched with
+the exact scan (materialized document_id filter), a plain filtered hnsw scan
+and, on pgvector >= 0.8, an iterative hnsw scan. Recall is measured against
+the exact scan and "returned" is the mean number of rows that came back,
+a filtered hnsw scan on a small document often returns fewer than k.
+
+The hnsw index is dropped during the load and rebuilt after, inside a
+transaction that is rolled back, nothing is kept. 10M rows needs roughly
+50GB of disk and a generous maintenance_work_mem.
+"""
+
+import argparse
+import statistics
+import time
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import Session
+
+from sliderblend.internal.models import (
+    DocumentEmbeddingsModel,
+    DocumentsModel,
+    UserModel,
+)
+from sliderblend.internal.services.search import _ann_statement, _exact_statement
+from sliderblend.pkg.db import engine
+
+BATCH = 10000
+HNSW_INDEX = "ix_document_embeddings_embedding_hnsw"
+
+
+def _unit_vectors(count: int, dims: int = 1024) -> np.ndarray:
+    vectors = np.random.standard_normal((count, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _create_document(session: Session, user_id, name: str) -> DocumentsModel:
+    document = DocumentsModel(
+        number_of_pages=1, document_name=name, size=0, user_id=user_id
+    )
+    document.create(session)
+    return document
+
+
+def _load(session: Session, document_id, count: int) -> np.ndarray:
+    """Copy count random chunks into document_id, returns the last batch."""
+    vectors = None
+    for offset in range(0, count, BATCH):
+        vectors = _unit_vectors(min(BATCH, count - offset))
+        rows = [
+            DocumentEmbeddingsModel(
+                text=f"chunk {offset + i}",
+                embedding=vector.tolist(),
+                page_number=(offset + i) // 5 + 1,
+                document_id=document_id,
+            ).model_dump()
+            for i, vector in enumerate(vectors)
+        ]
+        if err := DocumentEmbeddingsModel.copy_create(rows, session):
+            raise err
+    return vectors
+
+
+def _queries(vectors: np.ndarray, count: int) -> list[list[float]]:
+    picks = vectors[np.random.randint(len(vectors), size=count)]
+    return (picks + _unit_vectors(count) * 0.5).tolist()
+
+
+def _run(session: Session, build, document_id, queries, k: int) -> tuple[list, list]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        rows = session.exec(build(query, document_id, k)).all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([row.id for row in rows])
+    return results, latencies
+
+
+def _report(name: str, found: list, exact: list, latencies: list, k: int) -> None:
+    recall = statistics.mean(
+        len(set(a) & set(b)) / max(len(b), 1) for a, b in zip(found, exact)
+    )
+    returned = statistics.mean(len(rows) for rows in found)
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"    {name:<22} recall@{k} {recall:>6.3f}  returned {returned:>5.1f}  "
+        f"p50 {statistics.median(latencies):>8.2f}ms  p95 {p95:>8.2f}ms"
+    )
+
+
+def _supports_iterative_scan(session: Session) -> bool:
+    try:
+        with session.begin_nested():
+            session.execute(
+                text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)")
+            )
+        return True
+    except DBAPIError:
+        return False
+
+
+def _bench(session: Session, args, total_rows: int) -> None:
+    user = UserModel(telegram_user_id=str(uuid4()), first_name="bench")
+    user.create(session)
+    session.execute(text(f"DROP INDEX IF EXISTS {HNSW_INDEX}"))
+
+    # at 10k rows the large document is whatever the small one leaves
+    large_chunks = min(args.large_chunks, total_rows - args.small_chunks)
+    targets = {}
+    for name, chunks in (("small", args.small_chunks), ("large", large_chunks)):
+        document = _create_document(session, user.id, f"bench-{name}")
+        targets[name] = (document.id, chunks, _load(session, document.id, chunks))
+
+    filler_rows = total_rows - args.small_chunks - large_chunks
+    start = time.perf_counter()
+    for offset in range(0, max(filler_rows, 0), args.filler_chunks):
+        document = _create_document(session, user.id, f"bench-filler-{offset}")
+        _load(session, document.id, min(args.filler_chunks, filler_rows - offset))
+    print(f"  loaded {total_rows} rows in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    session.execute(
+        text("SELECT set_config('maintenance_work_mem', :mem, true)"),
+        {"mem": args.maintenance_work_mem},
+    )
+    session.execute(
+        text(
+            f"CREATE INDEX {HNSW_INDEX} ON document_embeddings "
+            "USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+    )
+    session.execute(text("ANALYZE document_embeddings"))
+    print(f"  built hnsw in {time.perf_counter() - start:.1f}s")
+
+    iterative = _supports_iterative_scan(session)
+    for name, (document_id, chunks, vectors) in targets.items():
+        print(f"  {name} document, {chunks} chunks")
+        queries = _queries(vectors, args.queries)
+        exact, latencies = _run(session, _exact_statement, document_id, queries, args.k)
+        _report("exact scan", exact, exact, latencies, args.k)
+
+        session.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+            {"ef": str(args.ef_search)},
+        )
+        modes = ["off", "relaxed_order"] if iterative else [None]
+        for mode in modes:
+            if mode:
+                session.execute(
+                    text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+                    {"mode": mode},
+                )
+            found, latencies = _run(session, _ann_statement, document_id, queries, args.k)
+            label = f"hnsw {mode}" if mode else "hnsw"
+            _report(label, found, exact, latencies, args.k)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10000, 1000000, 10000000]
+    )
+    parser.add_argument("--small-chunks", type=int, default=200)
+    parser.add_argument("--large-chunks", type=int, default=20000)
+    parser.add_argument("--filler-chunks", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, default=40)
+    parser.add_argument("--maintenance-work-mem", default="2GB")
+    args = parser.parse_args()
+
+    for total_rows in args.rows:
+        print(f"{total_rows} rows")
+        with Session(engine) as session:
+            _bench(session, args, total_rows)
+            session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare MB/s of AsyncS3Storage uploads and downloads across part sizes and
+concurrency, to pick STORAGE_PART_SIZE and STORAGE_TRANSFER_CONCURRENCY.
+
+    moto_server -p 5000  # or any S3 compatible endpoint, e.g. minio
+    python -m benchmarks.storage_transfer --endpoint-url http://localhost:5000 \\
+        --size-mb 64 --part-mb 5 8 16 --concurrency 1 4 8 16
+
+Objects are written under bench/ in --bucket (created if missing) and removed
+after. A local stand-in measures client overhead, not network latency; use
+the real endpoint for final numbers.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sliderblend.internal.storage import AsyncS3Storage
+
+MB = 1024**2
+
+
+def _report(name: str, size: int, elapsed: float) -> None:
+    print(f"  {name:<28} {size / MB / elapsed:>8.1f} MB/s ({elapsed:.2f}s)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--endpoint-url", default="http://localhost:5000")
+    parser.add_argument("--bucket", default="sliderblend-bench")
+    parser.add_argument("--access-key", default="testing")
+    parser.add_argument("--secret-key", default="testing")
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--part-mb", type=int, nargs="+", default=[5, 8, 16])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    storage = AsyncS3Storage(
+        args.bucket,
+        endpoint_url=args.endpoint_url,
+        access_key=args.access_key,
+        secret_key=args.secret_key,
+        max_pool_connections=max(args.concurrency),
+    )
+    client = await storage._get_client()
+    try:
+        await client.create_bucket(Bucket=args.bucket)
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    size = args.size_mb * MB
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "source")
+        with open(source, "wb") as file:
+            file.write(os.urandom(size))
+
+        key = "bench/single"
+        print("single stream")
+        start = time.perf_counter()
+        _, err = await storage.upload_to_bucket(source, key, part_size=size + 1)
+        if err:
+            raise err
+        _report("upload", size, time.perf_counter() - start)
+        start = time.perf_counter()
+        _, err = await storage.download_bytes(
+            key, os.path.join(tmp, "single"), part_size=size + 1
+        )
+        if err:
+            raise err
+        _report("download", size, time.perf_counter() - start)
+
+        for part_mb in args.part_mb:
+            print(f"{part_mb} MB parts")
+            for concurrency in args.concurrency:
+                key = f"bench/{part_mb}-{concurrency}"
+                start = time.perf_counter()
+                _, err = await storage.upload_to_bucket(
+                    source, key, part_size=part_mb * MB, concurrency=concurrency
+                )
+                if err:
+                    raise err
+                _report(f"upload x{concurrency}", size, time.perf_counter() - start)
+
+                destination = os.path.join(tmp, key.replace("/", "_"))
+                start = time.perf_counter()
+                _, err = await storage.download_bytes(
+                    key, destination, part_size=part_mb * MB, concurrency=concurrency
+                )
+                if err:
+                    raise err
+                _report(f"download x{concurrency}", size, time.perf_counter() - start)
+                assert os.path.getsize(destination) == size
+                os.remove(destination)
+
+    paginator = client.get_paginator("list_objects_v2")
+    async for page in paginator.paginate(Bucket=args.bucket, Prefix="bench/"):
+        for item in page.get("Contents", []):
+            await client.delete_object(Bucket=args.bucket, Key=item["Key"])
+    await storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Compare recall@k and latency of hnsw search against an exact scan.
+
+    python -m benchmarks.vector_search --rows 20000 --queries 50 --ef-search 20 40 100 200
+
+Rows are random unit vectors in one document, inserted inside a transaction
+that is rolled back, nothing is kept. Needs the hnsw migration applied.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from sliderblend.internal.models import (
+    DocumentEmbeddingsModel,
+    DocumentsModel,
+    UserModel,
+)
+from sliderblend.pkg.db import engine
+
+
+def _unit_vectors(count: int, dims: int = 1024) -> np.ndarray:
+    vectors = np.random.standard_normal((count, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _knn(session: Session, document_id, query: list[float], k: int) -> list:
+    distance = DocumentEmbeddingsModel.embedding.cosine_distance(query)
+    statement = (
+        select(DocumentEmbeddingsModel.id)
+        .where(DocumentEmbeddingsModel.document_id == document_id)
+        .order_by(distance)
+        .limit(k)
+    )
+    return list(session.exec(statement).all())
+
+
+def _run(session: Session, document_id, queries, k: int) -> tuple[list, list]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(_knn(session, document_id, query, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def _report(name: str, latencies: list[float], recall: float) -> None:
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(
+        f"{name:<20} recall@k {recall:>6.3f}  "
+        f"p50 {statistics.median(latencies):>7.2f}ms  p95 {p95:>7.2f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[20, 40, 100, 200])
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        user = UserModel(telegram_user_id=str(uuid4()), first_name="bench")
+        user.create(session)
+        document = DocumentsModel(
+            number_of_pages=1, document_name="bench", size=0, user_id=user.id
+        )
+        document.create(session)
+
+        vectors = _unit_vectors(args.rows)
+        rows = [
+            DocumentEmbeddingsModel(
+                text=f"chunk {i}",
+                embedding=vector.tolist(),
+                page_number=i // 5 + 1,
+                document_id=document.id,
+            ).model_dump()
+            for i, vector in enumerate(vectors)
+        ]
+        if err := DocumentEmbeddingsModel.copy_create(rows, session):
+            raise err
+        session.execute(text("ANALYZE document_embeddings"))
+        queries = [
+            vectors[random.randrange(args.rows)] + _unit_vectors(1)[0] * 0.5
+            for _ in range(args.queries)
+        ]
+        queries = [query.tolist() for query in queries]
+
+        session.execute(text("SET LOCAL enable_indexscan = off"))
+        exact, latencies = _run(session, document.id, queries, args.k)
+        _report("exact scan", latencies, 1.0)
+        session.execute(text("SET LOCAL enable_indexscan = on"))
+
+        for ef_search in args.ef_search:
+            session.execute(
+                text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+                {"ef": str(ef_search)},
+            )
+            found, latencies = _run(session, document.id, queries, args.k)
+            recall = statistics.mean(
+                len(set(a) & set(b)) / args.k for a, b in zip(found, exact)
+            )
+            _report(f"hnsw ef_search={ef_search}", latencies, recall)
+
+        session.rollback()
+
+
+if __name__ == "__main__":
+    main()
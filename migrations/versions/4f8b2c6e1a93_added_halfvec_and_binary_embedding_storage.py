@@ -0,0 +1,70 @@
+"""added halfvec and binary embedding storage
+
+Revision ID: 4f8b2c6e1a93
+Revises: e2a9c4d71f30
+Create Date: 2026-10-18 13:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f8b2c6e1a93'
+down_revision: Union[str, None] = 'e2a9c4d71f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # halfvec and bit hnsw indexes need pgvector >= 0.7
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column('documents', sa.Column('embedding_storage', sqlmodel.sql.sqltypes.AutoString(), server_default='vector', nullable=False))
+    op.alter_column('document_embeddings', 'embedding', existing_type=pgvector.sqlalchemy.vector.VECTOR(dim=1024), nullable=True)
+    op.add_column('document_embeddings', sa.Column('embedding_half', pgvector.sqlalchemy.halfvec.HALFVEC(dim=1024), nullable=True))
+    op.add_column('document_embeddings', sa.Column('embedding_binary', pgvector.sqlalchemy.bit.BIT(length=1024), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_document_embeddings_embedding_half_hnsw',
+            'document_embeddings',
+            ['embedding_half'],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding_half': 'halfvec_cosine_ops'},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_document_embeddings_embedding_binary_hnsw',
+            'document_embeddings',
+            ['embedding_binary'],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding_binary': 'bit_hamming_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_document_embeddings_embedding_binary_hnsw',
+            table_name='document_embeddings',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_document_embeddings_embedding_half_hnsw',
+            table_name='document_embeddings',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('document_embeddings', 'embedding_binary')
+    op.drop_column('document_embeddings', 'embedding_half')
+    # rows stored as halfvec or binary have no float vector to keep
+    op.execute("DELETE FROM document_embeddings WHERE embedding IS NULL")
+    op.alter_column('document_embeddings', 'embedding', existing_type=pgvector.sqlalchemy.vector.VECTOR(dim=1024), nullable=False)
+    op.drop_column('documents', 'embedding_storage')
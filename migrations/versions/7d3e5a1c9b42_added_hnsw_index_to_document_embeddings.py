@@ -0,0 +1,46 @@
+"""added hnsw index to document embeddings
+
+Revision ID: 7d3e5a1c9b42
+Revises: 1c474b8bcdba
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e5a1c9b42'
+down_revision: Union[str, None] = '1c474b8bcdba'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    # built concurrently so embedding writes are not blocked, which cannot
+    # happen inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_document_embeddings_embedding_hnsw',
+            'document_embeddings',
+            ['embedding'],
+            unique=False,
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_document_embeddings_embedding_hnsw',
+            table_name='document_embeddings',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,53 @@
+"""added chunk count and document id index
+
+Revision ID: b5e1f0c2d8a6
+Revises: 7d3e5a1c9b42
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1f0c2d8a6'
+down_revision: Union[str, None] = '7d3e5a1c9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column('documents', sa.Column('chunk_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        """
+        UPDATE documents SET chunk_count = counts.chunks
+        FROM (
+            SELECT document_id, count(*) AS chunks
+            FROM document_embeddings GROUP BY document_id
+        ) AS counts
+        WHERE documents.id = counts.document_id
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_document_embeddings_document_id',
+            'document_embeddings',
+            ['document_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_document_embeddings_document_id',
+            table_name='document_embeddings',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('documents', 'chunk_count')
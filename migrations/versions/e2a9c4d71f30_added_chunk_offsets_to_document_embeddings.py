@@ -0,0 +1,33 @@
+"""added chunk offsets to document embeddings
+
+Revision ID: e2a9c4d71f30
+Revises: b5e1f0c2d8a6
+Create Date: 2026-10-18 11:15:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import pgvector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4d71f30'
+down_revision: Union[str, None] = 'b5e1f0c2d8a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column('document_embeddings', sa.Column('page_end', sa.Integer(), nullable=True))
+    op.add_column('document_embeddings', sa.Column('char_start', sa.Integer(), nullable=True))
+    op.add_column('document_embeddings', sa.Column('char_end', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('document_embeddings', 'char_end')
+    op.drop_column('document_embeddings', 'char_start')
+    op.drop_column('document_embeddings', 'page_end')
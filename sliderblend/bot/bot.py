@@ -3,7 +3,10 @@ import asyncio
 from aiogram import Bot, Dispatcher, F
 from aiogram.types import Message
 
-from sliderblend.internal.storage import get_storage_provider
+from sliderblend.internal.storage import (
+    close_storage_providers,
+    get_async_storage_provider,
+)
 from sliderblend.pkg import MAX_FILE_SIZE, FilebaseSettings, TelegramSettings
 from sliderblend.pkg.logger import get_logger
 from sliderblend.pkg.utils import ValidFileType, file_size_mb, sanitize_filename
@@ -15,7 +18,7 @@ telegram_settings = TelegramSettings()
 dp = Dispatcher()
 storage_settings = FilebaseSettings()
 
-storage_provider = get_storage_provider("filebase", storage_settings)
+storage_provider, _ = get_async_storage_provider("filebase", storage_settings)
 
 bot = Bot(token=telegram_settings.telegram_bot_token)
 
@@ -42,7 +45,9 @@ async def handle_document(message: Message):
     document_name = sanitize_filename(document_.file_name)
     file_name = f"user:{user.id}/document:{document_name}"
     file_bytes_ = await bot.download_file(file_info.file_path)
-    _file, err = storage_provider.upload_bytes(file_bytes_, file_name, "documents")
+    _file, err = await storage_provider.upload_to_bucket(
+        file_bytes_, file_name, "documents"
+    )
     if err:
         logger.error(err)
         await response_message.edit_text(
@@ -53,7 +58,10 @@ async def handle_document(message: Message):
 
 async def main() -> None:
     logger.log("Starting polling")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await close_storage_providers()
     logger.log("Stopped polling")
 
 
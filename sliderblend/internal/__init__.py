@@ -1,12 +1,15 @@
+from sliderblend.internal.cache import SessionCache
 from sliderblend.internal.exceptions import IBMStorageError
 from sliderblend.internal.main import init_clients
-from sliderblend.internal.redis import RedisClient, RedisJob
+from sliderblend.internal.redis import EmbeddingCache, RedisClient, RedisJob
 from sliderblend.internal.storage import get_storage_provider
 
 __all__ = [
     "init_clients",
     "RedisClient",
     "RedisJob",
+    "EmbeddingCache",
+    "SessionCache",
     "IBMStorageError",
     "get_storage_provider",
 ]
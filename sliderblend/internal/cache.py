@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple, Type, TypeVar
+
+from sliderblend.internal.redis import TTL, RedisClient
+from sliderblend.pkg import get_logger
+from sliderblend.pkg.types import error
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+INVALIDATION_CHANNEL = "session_invalidate"
+
+
+class LRUCache:
+    """In-process cache bounded by number of entries and entry age."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._items[key] = (time.monotonic() + ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class SessionCache:
+    """
+    Session lookups served from an in-process LRU in front of Redis.
+
+    Writes go through Redis and are announced on a pub/sub channel, every
+    API worker running ``listen`` drops its local copy of the key. Entries
+    also expire after ``ttl`` seconds, which bounds staleness if an
+    invalidation is missed while the subscription reconnects, and never
+    outlive the session's own expiry in Redis.
+    """
+
+    def __init__(self, redis_client: RedisClient, maxsize: int, ttl: float):
+        self.redis_client = redis_client
+        self._local = LRUCache(maxsize, min(ttl, TTL))
+        self._invalidations = 0
+
+    async def get(
+        self, key: str, object_class: Type[T] = None
+    ) -> Tuple[Optional[T], error]:
+        """
+        Retrieve a session, from memory when possible.
+
+        Args:
+            key: The session key
+            object_class: Optional class to deserialize the data into
+
+        Returns:
+            Tuple[Optional[T], error]: Tuple containing the session (or None) and error (if any)
+        """
+        value = self._local.get(key)
+        if value is not None:
+            return value, None
+
+        invalidations = self._invalidations
+        value, err = await self.redis_client.get(key, object_class)
+        if err:
+            return None, err
+        # never serve a session from memory after redis expired it
+        remaining = await self.redis_client._instance.ttl(key)
+        # an invalidation that arrived during the lookup may be for this key
+        if invalidations == self._invalidations and remaining != -2:
+            self._local.set(key, value, remaining if remaining >= 0 else None)
+        return value, None
+
+    async def set(self, key: str, data: Any) -> error:
+        """
+        Store a session in Redis and evict stale copies on every worker.
+
+        Args:
+            key: The session key
+            data: The session data
+
+        Returns:
+            error: Error if the session could not be stored
+        """
+        err = await self.redis_client.create(key, data)
+        await self.invalidate(key)
+        return err
+
+    async def delete(self, key: str) -> bool:
+        """
+        Delete a session everywhere.
+
+        Args:
+            key: The session key
+
+        Returns:
+            bool: True if the session existed in Redis
+        """
+        deleted = await self.redis_client.delete(key)
+        await self.invalidate(key)
+        return deleted
+
+    async def invalidate(self, key: str) -> None:
+        self._local.pop(key)
+        await self.redis_client._instance.publish(INVALIDATION_CHANNEL, key)
+
+    async def listen(self) -> None:
+        """Evict keys invalidated by other workers, run as a background task."""
+        while True:
+            pubsub = self.redis_client._instance.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(timeout=1)
+                    if message:
+                        self._invalidations += 1
+                        self._local.pop(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Session invalidation listener failed: %s", e)
+                # invalidations may have been missed while disconnected
+                self._local.clear()
+                await asyncio.sleep(1)
+            finally:
+                pubsub.close()
@@ -0,0 +1,56 @@
+import json
+from dataclasses import is_dataclass
+from typing import Any, Type, TypeVar
+
+import orjson
+
+T = TypeVar("T")
+
+
+def _build(data: Any, object_class: Type[T] = None) -> T:
+    if object_class is None:
+        return data
+    if hasattr(object_class, "model_validate"):
+        return object_class.model_validate(data)
+    return object_class(**data)
+
+
+class JsonCodec:
+    """Plain json text, the format every key used before codecs existed."""
+
+    def encode(self, data: Any) -> str:
+        if hasattr(data, "model_dump_json"):
+            return str(data.model_dump_json())
+        if hasattr(data, "dict"):
+            return json.dumps(data.dict(), default=str)
+        if isinstance(data, dict):
+            return json.dumps(data)
+        raise TypeError(
+            "Data must be a dictionary or have amodel_dump_json or dict method"
+        )
+
+    def decode(self, data: str, object_class: Type[T] = None) -> T:
+        return _build(json.loads(data), object_class)
+
+
+class OrjsonCodec:
+    """
+    Compact json through orjson.
+
+    UUID, datetime and enum values are encoded natively, pydantic models
+    (UserCache) and dataclasses (Job) are turned into dicts first. Decoding
+    reads json written by JsonCodec as well.
+    """
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def encode(self, data: Any) -> str:
+        if hasattr(data, "model_dump"):
+            data = data.model_dump()
+        elif is_dataclass(data):
+            # orjson drops underscored dataclass fields like Job._date_published
+            data = data.__dict__
+        return orjson.dumps(data, option=self.option).decode("utf-8")
+
+    def decode(self, data: str, object_class: Type[T] = None) -> T:
+        return _build(orjson.loads(data), object_class)
@@ -1,6 +1,7 @@
 from sliderblend.internal.entities.document import (
+    acreate_document,
     create_document,
     create_document_embedding,
 )
 
-__all__ = ["create_document", "create_document_embedding"]
+__all__ = ["create_document", "acreate_document", "create_document_embedding"]
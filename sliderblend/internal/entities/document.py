@@ -12,6 +12,7 @@ from sliderblend.pkg.types import Error, error
 
 if TYPE_CHECKING:
     from sqlmodel import Session
+    from sqlmodel.ext.asyncio.session import AsyncSession
 
     from sliderblend.internal.schemas import CreateDocumentSchema
 
@@ -32,26 +33,43 @@ def create_document(
     return document, None
 
 
+async def acreate_document(
+    schema: CreateDocumentSchema, db: AsyncSession
+) -> Tuple[Optional[DocumentsModel], error]:
+    user, err = await UserModel.aget(value=schema.user_id, session=db)
+    if err:
+        return None, Error(f"User {schema.user_id} does not exist")
+
+    if not user.is_active or user.is_blocked:
+        return None, Error("User is inactive or has been blocked")
+
+    document, err = await DocumentsModel.model_validate(schema).acreate(db)
+    if err:
+        return None, err
+    return document, None
+
+
 def create_document_embedding(
     schema: CreateDocumentEmbeddingSchema, db: Session
 ) -> Optional[error]:
     # Validate related document exists
     document, err = DocumentsModel.get(value=schema.document_id, session=db)
     if err or document is None:
-        return None, Error(f"Document with id {schema.document_id} does not exist")
-
-    docs = schema.get_documents()
+        return Error(f"Document with id {schema.document_id} does not exist")
 
-    for doc in docs:
-        document_page, embedding_vector = doc
-        embedding_model = DocumentEmbeddingsModel(
+    rows = [
+        DocumentEmbeddingsModel(
             text=document_page.page_content,
-            embedding=embedding_vector,
+            **DocumentEmbeddingsModel.embedding_values(
+                embedding_vector, schema.storage
+            ),
             page_number=document_page.metadata["page"],
+            page_end=document_page.metadata.get("page_end"),
+            char_start=document_page.metadata.get("char_start"),
+            char_end=document_page.metadata.get("char_end"),
             document_id=schema.document_id,
-        )
-        _, err = embedding_model.create(db)
-        if err:
-            return err
-
-    return None
+        ).model_dump()
+        for document_page, embedding_vector in schema.get_documents()
+    ]
+    # one COPY for the whole document instead of an INSERT per chunk
+    return DocumentEmbeddingsModel.copy_create(rows, db)
@@ -1,9 +1,12 @@
 from cohere import AsyncClientV2
 
-from sliderblend.internal.storage import get_storage_provider 
+from sliderblend.internal.cache import SessionCache
+from sliderblend.internal.storage import (get_async_storage_provider,
+                                          get_storage_provider)
 from sliderblend.internal.redis import RedisClient, RedisJob
-from sliderblend.pkg import (ClientSettings, CohereSettings, FilebaseSettings,
-                             RedisSettings, get_logger)
+from sliderblend.pkg import (ClientSettings, CohereSettings, EmbedderSettings,
+                             FilebaseSettings, RedisSettings, StorageSettings,
+                             get_logger)
 
 logger = get_logger(__name__)
 
@@ -15,18 +18,36 @@ async def init_clients() -> ClientSettings:
     storage_settings = FilebaseSettings()
     redis_settings = RedisSettings()
     cohere_settings = CohereSettings()
+    async_storage_settings = StorageSettings()
 
     # Initialize clients
-    ibm_storage_repo = get_storage_provider("filebase", storage_settings)
+    ibm_storage_repo, _ = get_storage_provider("filebase", storage_settings)
+    storage_client, _ = get_async_storage_provider(
+        "filebase", storage_settings, async_storage_settings
+    )
     redis_client = RedisClient(redis_settings)
     redis_job = RedisJob(redis_settings)
+    session_cache = SessionCache(
+        redis_client,
+        maxsize=redis_settings.session_cache_size,
+        ttl=redis_settings.session_cache_ttl,
+    )
     cohere_client = AsyncClientV2(cohere_settings.cohere_api_key)
+    # services imports this package, so it can only be imported once loaded
+    from sliderblend.internal.services.embedders import get_embedder
+
+    embedder, err = get_embedder(EmbedderSettings(), cohere_settings)
+    if err:
+        raise err
 
     logger.info("All clients initialized")
 
     return ClientSettings(
         REDIS_JOB=redis_job,
         REDIS_CLIENT=redis_client,
+        SESSION_CACHE=session_cache,
         COHERE_CLIENT=cohere_client,
+        EMBEDDER=embedder,
         IBM_CLIENT=ibm_storage_repo,
+        STORAGE_CLIENT=storage_client,
     )
@@ -1,16 +1,62 @@
+import struct
 from datetime import datetime
-from typing import Any, Optional, Self, Tuple
+from io import BytesIO
+from typing import Any, Iterable, Optional, Self, Tuple
 from uuid import UUID, uuid4
 
+import psycopg2
+from pgvector import Bit, HalfVector, Vector
 from pydantic import ConfigDict
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlmodel import Field, Session, SQLModel
+from sqlmodel import Field, Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from sliderblend.pkg import get_logger
 from sliderblend.pkg.types import Error, error
 
 logger = get_logger(__name__)
 
+PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PGCOPY_TRAILER = struct.pack(">h", -1)
+PG_EPOCH = datetime(2000, 1, 1)
+
+
+def _encode_copy_value(value: Any) -> bytes:
+    """Encode a single value in the postgres binary COPY wire format."""
+    if value is None:
+        return struct.pack(">i", -1)
+    if isinstance(value, UUID):
+        data = value.bytes
+    elif isinstance(value, datetime):
+        delta = value.replace(tzinfo=None) - PG_EPOCH
+        micro = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+        data = struct.pack(">q", micro)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+    elif isinstance(value, bool):
+        data = struct.pack(">?", value)
+    elif isinstance(value, int):
+        data = struct.pack(">i", value)
+    elif isinstance(value, (Vector, HalfVector, Bit)):
+        data = value.to_binary()
+    else:
+        data = Vector(value).to_binary()
+    return struct.pack(">i", len(data)) + data
+
+
+def _encode_copy_rows(columns: list[str], rows: Iterable[dict[str, Any]]) -> BytesIO:
+    buffer = BytesIO()
+    buffer.write(PGCOPY_HEADER)
+    field_count = struct.pack(">h", len(columns))
+    for row in rows:
+        buffer.write(field_count)
+        for column in columns:
+            buffer.write(_encode_copy_value(row[column]))
+    buffer.write(PGCOPY_TRAILER)
+    buffer.seek(0)
+    return buffer
+
 
 class DatabaseMixin:
     def create(self, session: Session) -> Tuple[Optional[Self], error]:
@@ -34,6 +80,69 @@ class DatabaseMixin:
             logger.error(e, stack_info=True) 
             return Error(e)
 
+    async def acreate(self, session: AsyncSession) -> Tuple[Optional[Self], error]:
+        err = await self.asave(session)
+        if err:
+            return None, err
+        return self, None
+
+    async def asave(self, session: AsyncSession) -> error:
+        try:
+            session.add(self)
+            await session.flush()
+            await session.refresh(self)
+            return None
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(e, stack_info=True)
+            return Error(e)
+
+    @classmethod
+    def bulk_create(cls, rows: list[dict[str, Any]], session: Session) -> error:
+        """
+        Insert many rows with a single executemany statement.
+
+        Column defaults (id, dates) are filled in by sqlalchemy, so rows only
+        need the model specific fields.
+        """
+        if not rows:
+            return None
+        try:
+            session.execute(insert(cls), rows)
+            return None
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(e, stack_info=True)
+            return Error(e)
+
+    @classmethod
+    def copy_create(cls, rows: list[dict[str, Any]], session: Session) -> error:
+        """
+        Stream rows into the table with a binary ``COPY ... FROM STDIN``.
+
+        Unlike ``bulk_create`` no defaults are applied, every column of the
+        table must be present in each row. The copy runs on the session's
+        connection so it commits or rolls back with the rest of the session.
+        """
+        if not rows:
+            return None
+        columns = list(cls.__table__.columns.keys())
+        payload = _encode_copy_rows(columns, rows)
+        statement = (
+            f"COPY {cls.__tablename__} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT BINARY)"
+        )
+        try:
+            session.flush()
+            dbapi_connection = session.connection().connection.dbapi_connection
+            with dbapi_connection.cursor() as cursor:
+                cursor.copy_expert(statement, payload)
+            return None
+        except (SQLAlchemyError, psycopg2.Error) as e:
+            session.rollback()
+            logger.error(e, stack_info=True)
+            return Error(e)
+
     @classmethod
     def get(
         cls, *, field: str = "id", value: Any, session: Session
@@ -48,6 +157,21 @@ class DatabaseMixin:
             return user, None
         return None, Error(f"User with {field} = {value} not found")
 
+    @classmethod
+    async def aget(
+        cls, *, field: str = "id", value: Any, session: AsyncSession
+    ) -> Tuple[Optional[Self], error]:
+        field_attr = getattr(cls, field, None)
+
+        if field_attr is None:
+            return None, Error(f"Field '{field}' does not exist in the model.")
+        result = await session.exec(select(cls).where(field_attr == value).limit(1))
+        user = result.first()
+
+        if user:
+            return user, None
+        return None, Error(f"User with {field} = {value} not found")
+
     @classmethod
     def exists(cls, *, field: str = "id", value: Any, session: Session) -> bool:
         _, err = cls.get(field=field, value=value, session=session)
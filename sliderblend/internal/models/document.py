@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 from uuid import UUID
 
-from pgvector.sqlalchemy import Vector
+import numpy as np
+from pgvector import Bit, HalfVector
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
+from sqlalchemy import Index
 from sqlmodel import Field
 
 from sliderblend.internal.models.base import BaseModel
+from sliderblend.pkg.constants import EMBEDDING_DIMENSIONS
+
+# the column each EMBEDDER_STORAGE option writes to, int8 values fit a
+# halfvec exactly
+EMBEDDING_COLUMNS = {
+    "vector": "embedding",
+    "halfvec": "embedding_half",
+    "int8": "embedding_half",
+    "binary": "embedding_binary",
+}
 
 
 class DocumentsModel(BaseModel, table=True):
@@ -15,14 +28,70 @@ class DocumentsModel(BaseModel, table=True):
     document_name: str = Field(nullable=False)
     size: int = Field(nullable=False)
     is_embedded: bool = Field(default=False, nullable=False)
+    chunk_count: int = Field(default=0, nullable=False)
+    embedding_storage: str = Field(default="vector", nullable=False)
     user_id: UUID = Field(foreign_key="users.id", ondelete="CASCADE", nullable=False)
 
 
 class DocumentEmbeddingsModel(BaseModel, table=True):
     __tablename__ = "document_embeddings"
+    __table_args__ = (
+        Index("ix_document_embeddings_document_id", "document_id"),
+        Index(
+            "ix_document_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+        Index(
+            "ix_document_embeddings_embedding_half_hnsw",
+            "embedding_half",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding_half": "halfvec_cosine_ops"},
+        ),
+        Index(
+            "ix_document_embeddings_embedding_binary_hnsw",
+            "embedding_binary",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding_binary": "bit_hamming_ops"},
+        ),
+    )
     text: str = Field(nullable=False)
-    embedding: Any = Field(sa_type=Vector(1024))
+    # one of the three is set, picked by the document's embedding_storage
+    embedding: Any = Field(
+        default=None, sa_type=Vector(EMBEDDING_DIMENSIONS), nullable=True
+    )
+    embedding_half: Any = Field(
+        default=None, sa_type=HALFVEC(EMBEDDING_DIMENSIONS), nullable=True
+    )
+    embedding_binary: Any = Field(
+        default=None, sa_type=BIT(EMBEDDING_DIMENSIONS), nullable=True
+    )
     page_number: int = Field(nullable=False)
+    # where the chunk sits in the source, for highlighting and citations
+    page_end: Optional[int] = Field(default=None, nullable=True)
+    char_start: Optional[int] = Field(default=None, nullable=True)
+    char_end: Optional[int] = Field(default=None, nullable=True)
     document_id: UUID = Field(
         foreign_key="documents.id", ondelete="CASCADE", nullable=False
     )
+
+    @classmethod
+    def embedding_column(cls, storage: str):
+        return getattr(cls, EMBEDDING_COLUMNS[storage])
+
+    @staticmethod
+    def embedding_values(vector: list[float], storage: str) -> dict[str, Any]:
+        """Column values for one embedding, the unused columns are None."""
+        values = dict.fromkeys(EMBEDDING_COLUMNS.values())
+        column = EMBEDDING_COLUMNS[storage]
+        if column == "embedding":
+            values[column] = vector
+        elif column == "embedding_half":
+            values[column] = HalfVector(vector)
+        else:
+            values[column] = Bit(np.asarray(vector) > 0)
+        return values
@@ -1,15 +1,27 @@
-import json
-from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+import base64
+import hashlib
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, TypeVar
 from uuid import UUID
 
-from coredis import Redis
+import numpy as np
+from coredis import PureToken, Redis
+from coredis.exceptions import StreamDuplicateConsumerGroupError
+from coredis.response.types import StreamEntry
 
-from sliderblend.pkg import RedisSettings
-from sliderblend.pkg.types import Error, Job, error
+from sliderblend.internal.codecs import OrjsonCodec
+from sliderblend.pkg import RedisSettings, get_logger
+from sliderblend.pkg.types import PROCESS_STATE, Codec, Error, Job, error
 
 T = TypeVar("T")
 
+logger = get_logger(__name__)
+
 TTL = 36000  # seconds
+EMBEDDING_TTL = 30 * 24 * 3600  # seconds
+SCAN_COUNT = 500  # keys per SCAN page
+PIPELINE_CHUNK = 500  # commands per pipeline flush
+STREAM_MAXLEN = 10000  # approximate number of queue entries kept
 
 
 def _create_client(settings: RedisSettings):
@@ -24,9 +36,42 @@ def _create_client(settings: RedisSettings):
     return client
 
 
+def _chunks(items: List[Any], size: int) -> List[List[Any]]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
 class RedisClient:
-    def __init__(self, settings: RedisSettings):
+    def __init__(
+        self,
+        settings: RedisSettings,
+        codecs: Optional[Dict[str, Codec]] = None,
+        default_codec: Optional[Codec] = None,
+    ):
+        """
+        Args:
+            settings: Redis connection settings
+            codecs: Codec to use for keys starting with a given prefix, the
+                longest matching prefix wins
+            default_codec: Codec for every other key, orjson if not given
+        """
         self._instance = _create_client(settings)
+        self.codecs = codecs or {}
+        self.default_codec = default_codec or OrjsonCodec()
+
+    def codec_for(self, key: str) -> Codec:
+        prefixes = [prefix for prefix in self.codecs if key.startswith(prefix)]
+        if not prefixes:
+            return self.default_codec
+        return self.codecs[max(prefixes, key=len)]
+
+    def _serialize(self, key: str, data: Any) -> Tuple[Optional[str], error]:
+        try:
+            return self.codec_for(key).encode(data), None
+        except TypeError as e:
+            return None, Error(f"Could not serialize {key}: {e}")
+
+    def _deserialize(self, key: str, data: str, object_class: Type[T] = None) -> T:
+        return self.codec_for(key).decode(data, object_class)
 
     async def create(self, key: str, data: Any) -> error:
         """
@@ -39,44 +84,50 @@ class RedisClient:
         Returns:
             Tuple[bool, error]: Tuple containing success status and error (if any)
         """
-        if (
-            isinstance(data, dict)
-            or hasattr(data, "model_dump_json")
-            or hasattr(data, "dict")
-        ):
-            if hasattr(data, "model_dump_json"):
-                serialized_data = str(data.model_dump_json())
-            elif hasattr(data, "dict"):
-                serialized_data = str(data.dict())
-            else:
-                serialized_data = str(json.dumps(data))
-            success = await self._instance.set(key, serialized_data, ex=TTL)
-            return Error("Could not upload to redis") if not success else None
-        return Error(
-            "Data must be a dictionary or have amodel_dump_json or dict method"
-        )
-
-    async def batch_create(self, items: Dict[str, Any]) -> List[bool]:
+        serialized_data, err = self._serialize(key, data)
+        if err:
+            return err
+        success = await self._instance.set(key, serialized_data, ex=TTL)
+        return Error("Could not upload to redis") if not success else None
+
+    async def batch_create(
+        self,
+        items: Dict[str, Any],
+        *,
+        transaction: bool = False,
+        chunk_size: int = PIPELINE_CHUNK,
+    ) -> List[bool]:
         """
         Create multiple objects in a batch operation.
 
+        Commands are sent through a pipeline flushed every chunk_size items,
+        with transaction=True each chunk (not the whole batch) runs atomically.
+
         Args:
             items: Dictionary mapping keys to their data objects
+            transaction: Wrap every flushed chunk in MULTI/EXEC
+            chunk_size: Number of commands sent per pipeline flush
 
         Returns:
             List[bool]: List of success results for each operation
         """
-        pipe = self._instance.pipeline()
-
+        serialized = []
         for key, data in items.items():
-            serialized_data = (
-                data.model_dump_json()
-                if hasattr(data, "model_dump_json")
-                else json.dumps(data)
+            serialized_data, err = self._serialize(key, data)
+            serialized.append((key, serialized_data if not err else None))
+
+        results = []
+        for chunk in _chunks(serialized, chunk_size):
+            async with await self._instance.pipeline(transaction=transaction) as pipe:
+                for key, serialized_data in chunk:
+                    if serialized_data is not None:
+                        await pipe.set(key, serialized_data, ex=TTL)
+                replies = iter(await pipe.execute())
+            results.extend(
+                bool(next(replies)) if serialized_data is not None else False
+                for _, serialized_data in chunk
             )
-            pipe.set(key, serialized_data, ex=TTL)
-
-        return pipe.execute()
+        return results
 
     async def get(
         self, key: str, object_class: Type[T] = None
@@ -96,42 +147,54 @@ class RedisClient:
         if data is None:
             return None, Error("Not found")
 
-        deserialized_data = json.loads(data)
+        return self._deserialize(key, data, object_class), None
 
-        if object_class:
-            return object_class(**deserialized_data), None
-        return deserialized_data, None
+    async def pop(
+        self, key: str, object_class: Type[T] = None
+    ) -> Tuple[Optional[T], error]:
+        """
+        Retrieve and delete an object in one step, only one caller gets it.
+
+        Args:
+            key: The unique identifier/key for the object
+            object_class: Optional class to deserialize the data into
+
+        Returns:
+            Tuple[Optional[T], error]: Tuple containing the removed object (or None) and error (if any)
+        """
+        data = await self._instance.getdel(key)
+
+        if data is None:
+            return None, Error("Not found")
+
+        return self._deserialize(key, data, object_class), None
 
     async def get_many(
-        self, keys: List[str], object_class: Type[T] = None
+        self,
+        keys: List[str],
+        object_class: Type[T] = None,
+        *,
+        chunk_size: int = PIPELINE_CHUNK,
     ) -> List[Optional[T]]:
         """
-        Retrieve multiple objects from Redis.
+        Retrieve multiple objects from Redis, one MGET per chunk of keys.
 
         Args:
             keys: List of keys to get
             object_class: Optional class to deserialize the data into
+            chunk_size: Number of keys fetched per MGET
 
         Returns:
             List[Optional[T]]: List of getd objects (None for keys that don't exist)
         """
-        pipe = self._instance.pipeline()
-
-        for key in keys:
-            pipe.get(key)
-
-        results = pipe.execute()
         objects = []
-
-        for data in results:
-            if data is None:
-                objects.append(None)
-            else:
-                deserialized_data = json.loads(data)
-                if object_class:
-                    objects.append(object_class(**deserialized_data))
-                else:
-                    objects.append(deserialized_data)
+        for chunk in _chunks(keys, chunk_size):
+            for key, data in zip(chunk, await self._instance.mget(chunk)):
+                objects.append(
+                    None
+                    if data is None
+                    else self._deserialize(key, data, object_class)
+                )
 
         return objects
 
@@ -148,8 +211,53 @@ class RedisClient:
         Returns:
             List[T]: List of get objects
         """
-        keys = self._instance.keys(pattern)
-        return await self.get_many(keys, object_class) if keys else []
+        return [obj async for obj in self.iter_objects(pattern, object_class)]
+
+    async def iter_keys(
+        self, pattern: str = "*", count: int = SCAN_COUNT
+    ) -> AsyncIterator[List[str]]:
+        """
+        Iterate over keys matching a pattern with SCAN, one page at a time.
+
+        Unlike KEYS this never blocks the server, but a key may show up in
+        more than one page if the keyspace changes while iterating.
+
+        Args:
+            pattern: Redis key pattern to match
+            count: SCAN COUNT hint, roughly the number of keys per page
+
+        Yields:
+            List[str]: Keys of one non empty page
+        """
+        cursor = None
+        while cursor != 0:
+            cursor, keys = await self._instance.scan(
+                cursor or 0, match=pattern, count=count
+            )
+            if keys:
+                yield list(keys)
+
+    async def iter_objects(
+        self,
+        pattern: str = "*",
+        object_class: Type[T] = None,
+        count: int = SCAN_COUNT,
+    ) -> AsyncIterator[T]:
+        """
+        Iterate over objects matching a pattern, one MGET per SCAN page.
+
+        Args:
+            pattern: Redis key pattern to match
+            object_class: Optional class to deserialize the data into
+            count: SCAN COUNT hint, roughly the number of keys per page
+
+        Yields:
+            T: Each object still present when its page is fetched
+        """
+        async for keys in self.iter_keys(pattern, count):
+            for obj in await self.get_many(keys, object_class):
+                if obj is not None:
+                    yield obj
 
     async def update(self, key: str, data: Any) -> error:
         """
@@ -164,17 +272,28 @@ class RedisClient:
         """
         return await self.create(key, data)  # Using create since Redis SET replaces
 
-    async def batch_update(self, items: Dict[str, Any]) -> List[bool]:
+    async def batch_update(
+        self,
+        items: Dict[str, Any],
+        *,
+        transaction: bool = False,
+        chunk_size: int = PIPELINE_CHUNK,
+    ) -> List[bool]:
         """
         Update multiple objects in a batch operation.
 
         Args:
             items: Dictionary mapping keys to their updated data
+            transaction: Wrap every flushed chunk in MULTI/EXEC
+            chunk_size: Number of commands sent per pipeline flush
 
         Returns:
             List[bool]: List of success results for each operation
         """
-        return await self.batch_create(items)  # Same as batch create since SET replaces
+        # Same as batch create since SET replaces
+        return await self.batch_create(
+            items, transaction=transaction, chunk_size=chunk_size
+        )
 
     async def delete(self, key: str) -> bool:
         """
@@ -186,23 +305,26 @@ class RedisClient:
         Returns:
             bool: True if deletion was successful
         """
-        deleted_count = self._instance.delete(key)
+        deleted_count = await self._instance.delete([key])
         return deleted_count > 0
 
-    async def delete_many(self, keys: List[str]) -> int:
+    async def delete_many(
+        self, keys: List[str], *, chunk_size: int = PIPELINE_CHUNK
+    ) -> int:
         """
-        Delete multiple objects from Redis.
+        Delete multiple objects from Redis, one UNLINK per chunk of keys.
 
         Args:
             keys: List of keys to delete
+            chunk_size: Number of keys removed per UNLINK
 
         Returns:
             int: Number of objects successfully deleted
         """
-        if not keys:
-            return 0
-
-        return await self._instance.delete(*keys)
+        deleted = 0
+        for chunk in _chunks(keys, chunk_size):
+            deleted += await self._instance.unlink(chunk)
+        return deleted
 
     async def delete_all(self, pattern: str = "*") -> int:
         """
@@ -214,11 +336,10 @@ class RedisClient:
         Returns:
             int: Number of objects deleted
         """
-        keys = self._instance.keys(pattern)
-        if not keys:
-            return 0
-
-        return await self._instance.delete(*keys)
+        deleted = 0
+        async for keys in self.iter_keys(pattern):
+            deleted += await self._instance.unlink(keys)
+        return deleted
 
 
 class RedisJob:
@@ -228,6 +349,38 @@ class RedisJob:
         """Initialize the Jobs client."""
         self.redis_client = RedisClient(settings)
         self.job_prefix = "job:"
+        self.state_prefix = "job_state:"
+        self.stream_key = "job_stream"
+        self.group_name = "workers"
+        self._group_ready = False
+
+    def _state_keys(self) -> List[str]:
+        return [f"{self.state_prefix}{state}" for state in PROCESS_STATE]
+
+    async def _save_job(self, job: Job) -> error:
+        """
+        Store a job and move it to its state index in one transaction.
+
+        Each state has a sorted set of job ids scored by the time of the
+        last write, members older than TTL belong to expired jobs.
+        """
+        job_id = str(job.job_id)
+        serialized_data, err = self.redis_client._serialize(
+            f"{self.job_prefix}{job_id}", job
+        )
+        if err:
+            return err
+        async with await self.redis_client._instance.pipeline(
+            transaction=True
+        ) as pipe:
+            for state_key in self._state_keys():
+                await pipe.zrem(state_key, [job_id])
+            await pipe.set(f"{self.job_prefix}{job_id}", serialized_data, ex=TTL)
+            await pipe.zadd(
+                f"{self.state_prefix}{job.process_state}", {job_id: time.time()}
+            )
+            results = await pipe.execute()
+        return None if results[-2] else Error("Could not upload to redis")
 
     async def create_job(self, redis_job: Job) -> Tuple[Optional[Job], error]:
         """
@@ -239,9 +392,7 @@ class RedisJob:
         Returns:
             Tuple[Optional[Job], error]: Tuple containing the created job (or None) and error (if any)
         """
-        job_id = str(redis_job.job_id)
-        key = f"{self.job_prefix}{job_id}"
-        err = await self.redis_client.create(key, redis_job)
+        err = await self._save_job(redis_job)
 
         if err:
             return None, err
@@ -294,9 +445,7 @@ class RedisJob:
         Returns:
             Tuple[bool, error]: Tuple containing success status and error (if any)
         """
-        job_id = str(job.job_id)
-        key = f"{self.job_prefix}{job_id}"
-        return await self.redis_client.update(key, job)
+        return await self._save_job(job)
 
     async def delete_job(self, job_id: UUID) -> bool:
         """
@@ -308,8 +457,7 @@ class RedisJob:
         Returns:
             bool: True if deletion was successful
         """
-        key = f"{self.job_prefix}{str(job_id)}"
-        return await self.redis_client.delete(key)
+        return await self.delete_jobs([job_id]) > 0
 
     async def delete_jobs(self, job_ids: List[UUID]) -> int:
         """
@@ -321,8 +469,186 @@ class RedisJob:
         Returns:
             int: Number of jobs successfully deleted
         """
-        keys = [f"{self.job_prefix}{str(job_id)}" for job_id in job_ids]
-        return await self.redis_client.delete_many(keys)
+        if not job_ids:
+            return 0
+        ids = [str(job_id) for job_id in job_ids]
+        async with await self.redis_client._instance.pipeline(
+            transaction=True
+        ) as pipe:
+            await pipe.delete([f"{self.job_prefix}{job_id}" for job_id in ids])
+            for state_key in self._state_keys():
+                await pipe.zrem(state_key, ids)
+            results = await pipe.execute()
+        return results[0]
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.redis_client._instance.xgroup_create(
+                self.stream_key, self.group_name, identifier="0", mkstream=True
+            )
+        except StreamDuplicateConsumerGroupError:
+            pass
+        self._group_ready = True
+
+    async def _load_entries(
+        self, entries: Tuple[StreamEntry, ...]
+    ) -> List[Tuple[str, Job]]:
+        claimed = []
+        for entry in entries:
+            job, err = await self.get_job(entry.field_values["job_id"])
+            if err:
+                # the job expired or was deleted, nothing left to process
+                await self.ack_job(entry.identifier)
+                continue
+            claimed.append((entry.identifier, job))
+        return claimed
+
+    async def enqueue_job(self, job: Job) -> error:
+        """
+        Add a job to the work stream consumed by the embedding workers.
+
+        Args:
+            job: The job to enqueue, it must already be stored with create_job
+
+        Returns:
+            error: Error if the job could not be queued
+        """
+        await self._ensure_group()
+        message_id = await self.redis_client._instance.xadd(
+            self.stream_key,
+            {"job_id": str(job.job_id)},
+            trim_strategy=PureToken.MAXLEN,
+            trim_operator=PureToken.APPROXIMATELY,
+            threshold=STREAM_MAXLEN,
+        )
+        return Error("Could not queue job") if not message_id else None
+
+    async def claim_jobs(
+        self, consumer: str, count: int = 1, block: int = 5000
+    ) -> List[Tuple[str, Job]]:
+        """
+        Claim new jobs for a consumer of the worker group.
+
+        Claimed jobs stay pending for this consumer until acked, if the
+        consumer dies they are handed to another one by reclaim_stale_jobs.
+
+        Args:
+            consumer: Unique name of the calling worker
+            count: Maximum number of jobs to claim
+            block: Milliseconds to wait for new jobs
+
+        Returns:
+            List[Tuple[str, Job]]: Message id and job for every claimed job
+        """
+        await self._ensure_group()
+        response = await self.redis_client._instance.xreadgroup(
+            self.group_name,
+            consumer,
+            streams={self.stream_key: ">"},
+            count=count,
+            block=block,
+        )
+        if not response:
+            return []
+        return await self._load_entries(response.get(self.stream_key, ()))
+
+    async def reclaim_stale_jobs(
+        self,
+        consumer: str,
+        min_idle_time: int,
+        count: int = 1,
+        max_deliveries: Optional[int] = None,
+    ) -> List[Tuple[str, Job]]:
+        """
+        Take over jobs another consumer claimed but never acked.
+
+        A job delivered more than max_deliveries times is marked failed and
+        acked instead of being handed out again.
+
+        Args:
+            consumer: Unique name of the calling worker
+            min_idle_time: Milliseconds a job must be pending before it is
+                considered abandoned (the visibility timeout)
+            count: Maximum number of jobs to reclaim
+            max_deliveries: Deliveries before a job is given up on, None
+                retries forever
+
+        Returns:
+            List[Tuple[str, Job]]: Message id and job for every reclaimed job
+        """
+        await self._ensure_group()
+        response = await self.redis_client._instance.xautoclaim(
+            self.stream_key,
+            self.group_name,
+            consumer,
+            min_idle_time=min_idle_time,
+            start="0-0",
+            count=count,
+        )
+        claimed = await self._load_entries(response[1])
+        if max_deliveries is None:
+            return claimed
+
+        retried = []
+        for message_id, job in claimed:
+            pending = await self.redis_client._instance.xpending(
+                self.stream_key,
+                self.group_name,
+                start=message_id,
+                end=message_id,
+                count=1,
+            )
+            if pending and pending[0].delivered > max_deliveries:
+                job.process_state = PROCESS_STATE.FAILED
+                await self._save_job(job)
+                await self.ack_job(message_id)
+                logger.error(
+                    "Job %s failed after %d deliveries",
+                    job.job_id,
+                    pending[0].delivered - 1,
+                )
+                continue
+            retried.append((message_id, job))
+        return retried
+
+    async def touch_job(self, consumer: str, message_id: str) -> bool:
+        """
+        Reset the idle time of a job this consumer is still working on, so
+        reclaim_stale_jobs does not hand it to another worker.
+
+        Args:
+            consumer: Unique name of the calling worker
+            message_id: Stream message id returned when the job was claimed
+
+        Returns:
+            bool: True if the job was still pending
+        """
+        claimed = await self.redis_client._instance.xclaim(
+            self.stream_key,
+            self.group_name,
+            consumer,
+            min_idle_time=0,
+            identifiers=[message_id],
+            justid=True,
+        )
+        return len(claimed) > 0
+
+    async def ack_job(self, message_id: str) -> bool:
+        """
+        Mark a claimed job as done so it is never redelivered.
+
+        Args:
+            message_id: Stream message id returned when the job was claimed
+
+        Returns:
+            bool: True if the job was pending
+        """
+        acked = await self.redis_client._instance.xack(
+            self.stream_key, self.group_name, [message_id]
+        )
+        return acked > 0
 
     async def get_jobs_by_state(self, state: str) -> List[Job]:
         """
@@ -334,8 +660,14 @@ class RedisJob:
         Returns:
             List[Job]: List of jobs with the specified state
         """
-        all_jobs = self.redis_client.get_all_jobs()
-        return [job for job in all_jobs if job.job_state == state]
+        state_key = f"{self.state_prefix}{state}"
+        # drop index entries whose job has expired
+        await self.redis_client._instance.zremrangebyscore(
+            state_key, "-inf", time.time() - TTL
+        )
+        job_ids = await self.redis_client._instance.zrange(state_key, 0, -1)
+        jobs = await self.get_jobs(list(job_ids))
+        return [job for job in jobs if job is not None]
 
     async def count_jobs_by_state(self) -> Dict[Any, int]:
         """
@@ -344,11 +676,90 @@ class RedisJob:
         Returns:
             Dict[Any, int]: Dictionary mapping states to counts
         """
-        all_jobs = self.redis_client.get_all_jobs()
-        counts = {}
+        oldest = time.time() - TTL
+        async with await self.redis_client._instance.pipeline(
+            transaction=False
+        ) as pipe:
+            for state_key in self._state_keys():
+                await pipe.zcount(state_key, f"({oldest}", "+inf")
+            results = await pipe.execute()
+
+        return {
+            state: count for state, count in zip(PROCESS_STATE, results) if count
+        }
+
+
+class EmbeddingCache:
+    """Embeddings keyed by the sha256 of the chunk text and the model name.
+
+    Identical chunks share one entry no matter which document they came from,
+    vectors are stored as base64 encoded float32 bytes.
+    """
+
+    def __init__(self, settings: RedisSettings, model: str):
+        self._instance = _create_client(settings)
+        self.model = model
+        self.key_prefix = f"embedding:{model}:"
+        self.stats_key = f"embedding_stats:{model}"
+
+    def _key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.key_prefix}{digest}"
+
+    async def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings and record hits and misses.
+
+        Args:
+            texts: Chunk texts to look up
+
+        Returns:
+            List[Optional[List[float]]]: Embedding per text, None on a miss
+        """
+        if not texts:
+            return []
+        values = await self._instance.mget([self._key(text) for text in texts])
+        hits = sum(value is not None for value in values)
+
+        async with await self._instance.pipeline(transaction=False) as pipe:
+            await pipe.hincrby(self.stats_key, "hits", hits)
+            await pipe.hincrby(self.stats_key, "misses", len(texts) - hits)
+            await pipe.execute()
+
+        return [
+            None
+            if value is None
+            else np.frombuffer(base64.b64decode(value), dtype=np.float32).tolist()
+            for value in values
+        ]
+
+    async def set_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Store embeddings for the given texts.
+
+        Args:
+            texts: Chunk texts
+            embeddings: Embedding for each text, in the same order
+        """
+        if not texts:
+            return
+        async with await self._instance.pipeline(transaction=False) as pipe:
+            for text, embedding in zip(texts, embeddings):
+                value = base64.b64encode(
+                    np.asarray(embedding, dtype=np.float32).tobytes()
+                ).decode("ascii")
+                await pipe.set(self._key(text), value, ex=EMBEDDING_TTL)
+            await pipe.execute()
 
-        for job in all_jobs:
-            state = job.job_state
-            counts[state] = counts.get(state, 0) + 1
+    async def stats(self) -> Dict[str, int]:
+        """
+        Hit and miss counters across every process using the cache.
 
-        return counts
+        Returns:
+            Dict[str, int]: Mapping with ``hits`` and ``misses``
+        """
+        counters = await self._instance.hgetall(self.stats_key)
+        return {
+            "hits": int(counters.get("hits", 0)),
+            "misses": int(counters.get("misses", 0)),
+        }
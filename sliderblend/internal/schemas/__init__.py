@@ -3,6 +3,13 @@ from sliderblend.internal.schemas.document import (
     CreateDocumentSchema,
     GetDocumentSchema,
     CreateDocumentEmbeddingSchema,
+    SearchRequestSchema,
+    SearchResultSchema,
+)
+from sliderblend.internal.schemas.upload import (
+    PendingUpload,
+    UploadCompleteSchema,
+    UploadUrlRequestSchema,
 )
 from sliderblend.internal.schemas.user import SessionData, UserCache
 
@@ -12,6 +19,11 @@ __all__ = [
     "CreateDocumentSchema",
     "GetDocumentSchema",
     "CreateDocumentEmbeddingSchema",
+    "SearchRequestSchema",
+    "SearchResultSchema",
     "BotChunkRequestSchema",
     "BotRequestSchema",
+    "UploadUrlRequestSchema",
+    "UploadCompleteSchema",
+    "PendingUpload",
 ]
@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from langchain_core.documents import Document
@@ -21,10 +22,28 @@ class GetDocumentSchema(BaseSchema):
     user_id: UUID
 
 
+class SearchRequestSchema(BaseModel):
+    document_id: UUID
+    query: str = Field(min_length=1)
+    k: Optional[int] = Field(default=None, gt=0, le=100)
+    ef_search: Optional[int] = Field(default=None, gt=0, le=1000)
+
+
+class SearchResultSchema(BaseModel):
+    id: UUID
+    text: str
+    page_number: int
+    page_end: Optional[int] = None
+    char_start: Optional[int] = None  # offset in page_number
+    char_end: Optional[int] = None  # offset in page_end
+    score: float  # cosine similarity, 1 is identical
+
+
 class CreateDocumentEmbeddingSchema(BaseModel):
     document: list[Document]
     embedding: list[list[float]]
     document_id: UUID
+    storage: str = "vector"  # EMBEDDER_STORAGE the vectors are kept as
 
     def get_documents(self) -> list[list[Document, list[float]]]:
         return list(zip(self.document, self.embedding))
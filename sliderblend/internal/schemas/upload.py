@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class UploadUrlRequestSchema(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    filename: str
+    size: int = Field(gt=0)
+
+
+class UploadCompleteSchema(BaseModel):
+    upload_id: UUID
+    number_of_pages: int = 0
+
+
+class PendingUpload(BaseModel):
+    upload_id: UUID
+    user_id: UUID
+    file_key: str
+    object_key: str
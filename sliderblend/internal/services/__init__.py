@@ -1,3 +1,19 @@
 from sliderblend.internal.services.main import start_chunkning_process 
+from sliderblend.internal.services.embedders import (
+    CoalescingEmbedder,
+    CohereEmbedder,
+    FakeEmbedder,
+    LocalEmbedder,
+    get_embedder,
+)
+from sliderblend.internal.services.search import search
 
-__all__ = ["start_chunkning_process"]
+__all__ = [
+    "start_chunkning_process",
+    "search",
+    "get_embedder",
+    "CohereEmbedder",
+    "CoalescingEmbedder",
+    "LocalEmbedder",
+    "FakeEmbedder",
+]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from sliderblend.internal.services.chunking import word_spans
+from sliderblend.pkg import BATCH_SIZE, get_logger
+
+if TYPE_CHECKING:
+    import httpx
+
+    from sliderblend.pkg import CohereSettings
+
+logger = get_logger(__name__)
+
+GROWTH = 1.25  # budget multiplier after a request under the target latency
+LOW_REMAINING = 5  # requests left in the window before batches are filled up
+REMAINING_HEADERS = (
+    "x-ratelimit-remaining-requests",
+    "x-trial-endpoint-call-remaining",
+)
+RESET_HEADERS = ("x-ratelimit-reset-requests",)
+DURATION = re.compile(
+    r"(?:([\d.]+)h)?(?:([\d.]+)m(?!s))?(?:([\d.]+)s)?(?:([\d.]+)ms)?$"
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(word_spans(text)[0]))
+
+
+def _seconds(value: str) -> Optional[float]:
+    """Parse "12", "1.5" or go style "6m0s" and "20ms" durations."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    match = DURATION.match(value.strip())
+    if not match or not any(match.groups()):
+        return None
+    try:
+        hours, minutes, seconds, millis = (
+            float(group or 0) for group in match.groups()
+        )
+    except ValueError:
+        return None
+    return hours * 3600 + minutes * 60 + seconds + millis / 1000
+
+
+class AdaptiveBatcher:
+    """
+    Size embed requests by tokens instead of a fixed number of texts.
+
+    A batch holds at most max_texts texts and token_budget tokens. The
+    budget grows while requests finish under target_latency, shrinks in
+    proportion when they run over and halves on timeouts. Rate limit headers
+    seen by observe_response pause new requests until the window resets and
+    fill batches up when few requests are left. One instance is shared by
+    every job using the same api key.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_texts: int = BATCH_SIZE,
+        token_budget: int = 16384,
+        min_tokens: int = 512,
+        max_tokens: int = 49152,
+        target_latency: float = 2.0,
+    ) -> None:
+        self.max_texts = max_texts
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.token_budget = min(max(token_budget, min_tokens), max_tokens)
+        self.target_latency = target_latency
+        self._resume_at = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: CohereSettings) -> AdaptiveBatcher:
+        return cls(
+            token_budget=settings.cohere_batch_tokens,
+            min_tokens=settings.cohere_min_batch_tokens,
+            max_tokens=settings.cohere_max_batch_tokens,
+            target_latency=settings.cohere_target_latency,
+        )
+
+    def _set_budget(self, budget: float) -> None:
+        budget = int(min(max(budget, self.min_tokens), self.max_tokens))
+        if budget != self.token_budget:
+            logger.debug("Embed token budget %d -> %d", self.token_budget, budget)
+        self.token_budget = budget
+
+    def next_batch(
+        self, tokens: Sequence[int], start: int, max_texts: Optional[int] = None
+    ) -> int:
+        """Number of texts from start that fit the current budget, at least one."""
+        limit = min(max_texts or self.max_texts, self.max_texts)
+        stop = min(start + limit, len(tokens))
+        total = tokens[start]
+        end = start + 1
+        while end < stop and total + tokens[end] <= self.token_budget:
+            total += tokens[end]
+            end += 1
+        return end - start
+
+    def observe(self, *, tokens: int, latency: float) -> None:
+        """Adjust the budget after a successful request."""
+        if latency > self.target_latency:
+            # scale toward the target, only when the batch was near the budget
+            # so a small tail batch does not reset it
+            if tokens >= self.token_budget / 2:
+                self._set_budget(tokens * self.target_latency / latency)
+        else:
+            self._set_budget(self.token_budget * GROWTH)
+
+    def shrink(self) -> None:
+        """Halve the budget after a timeout or server error."""
+        self._set_budget(self.token_budget / 2)
+
+    def pause(self, seconds: float) -> None:
+        self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self._resume_at - time.monotonic())
+
+    async def wait(self) -> None:
+        """Sleep until a rate limit window reported by the provider resets."""
+        if delay := self.paused_for:
+            logger.info("Embedding rate limited, waiting %.2fs", delay)
+            await asyncio.sleep(delay)
+
+    async def observe_response(self, response: httpx.Response) -> None:
+        """httpx response hook, reads the provider's rate limit headers."""
+        headers = response.headers
+        if retry_after := headers.get("retry-after"):
+            if (seconds := _seconds(retry_after)) is not None:
+                self.pause(seconds)
+
+        remaining = next(
+            (headers[name] for name in REMAINING_HEADERS if name in headers), None
+        )
+        if remaining is None or not remaining.isdigit():
+            return
+        if int(remaining) <= LOW_REMAINING:
+            # few requests left, make each of them count
+            self._set_budget(self.max_tokens)
+        if int(remaining) == 0:
+            reset = next(
+                (headers[name] for name in RESET_HEADERS if name in headers), None
+            )
+            if reset and (seconds := _seconds(reset)) is not None:
+                self.pause(seconds)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+from tokenizers import Tokenizer
+
+from sliderblend.pkg import get_logger
+
+if TYPE_CHECKING:
+    from sliderblend.pkg import ChunkSettings
+
+logger = get_logger(__name__)
+
+EMBED_MAX_TOKENS = 512  # embed-english-v3.0 truncates anything longer
+PAGE_SEPARATOR = "\n\n"
+
+# ascii character classes for the word count tokenizer, anything past ascii
+# counts as a word character
+SPACE, WORD, PUNCT = 0, 1, 2
+ASCII_CLASSES = np.array(
+    [
+        SPACE if chr(c).isspace() else WORD if chr(c).isalnum() or c == 95 else PUNCT
+        for c in range(128)
+    ],
+    dtype=np.int8,
+)
+
+# how good a place the gap after a token is to end a chunk
+PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n")
+LINE_BREAK = re.compile(r"\n")
+SENTENCE_BREAK = re.compile(r"[.!?](?=\s)")
+
+
+def word_spans(buffer: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Character spans of every word and punctuation mark in buffer.
+
+    Stands in for the model tokenizer when none is configured, it undercounts
+    long words so keep chunk_max_tokens well under EMBED_MAX_TOKENS with it.
+    """
+    codes = np.frombuffer(buffer.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    classes = np.where(
+        codes < 128, ASCII_CLASSES[np.minimum(codes, 127)], WORD
+    ).astype(np.int8)
+    previous = np.concatenate(([SPACE], classes[:-1]))
+    following = np.concatenate((classes[1:], [SPACE]))
+    is_token = classes != SPACE
+    starts = np.flatnonzero(is_token & ((classes == PUNCT) | (previous != WORD)))
+    ends = np.flatnonzero(is_token & ((classes == PUNCT) | (following != WORD))) + 1
+    return starts, ends
+
+
+class TokenChunker:
+    """
+    Pack page text into chunks of at most max_tokens tokens.
+
+    A window of pages is joined into one buffer and tokenized in a single
+    pass, chunks are then cut from token offsets, preferring paragraph, line
+    and sentence ends, so only the final chunk text is ever copied. Every
+    chunk records the page it starts and ends on and its character offsets
+    within those pages.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 256,
+        overlap_tokens: int = 32,
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> None:
+        if max_tokens > EMBED_MAX_TOKENS:
+            logger.warning(
+                "chunk size %d is over the model limit, using %d",
+                max_tokens,
+                EMBED_MAX_TOKENS,
+            )
+        self.max_tokens = min(max_tokens, EMBED_MAX_TOKENS)
+        self.overlap_tokens = min(overlap_tokens, self.max_tokens // 2)
+        self.tokenizer = tokenizer
+
+    @classmethod
+    def from_settings(cls, settings: ChunkSettings) -> TokenChunker:
+        tokenizer = None
+        if settings.chunk_tokenizer:
+            tokenizer = Tokenizer.from_file(settings.chunk_tokenizer)
+        return cls(
+            max_tokens=settings.chunk_max_tokens,
+            overlap_tokens=settings.chunk_overlap_tokens,
+            tokenizer=tokenizer,
+        )
+
+    def _token_spans(self, buffer: str) -> tuple[np.ndarray, np.ndarray]:
+        if self.tokenizer is not None:
+            offsets = self.tokenizer.encode(buffer, add_special_tokens=False).offsets
+            spans = np.array([span for span in offsets if span[1] > span[0]])
+            if not len(spans):
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+            return spans[:, 0], spans[:, 1]
+        return word_spans(buffer)
+
+    @staticmethod
+    def _break_scores(buffer: str, starts: np.ndarray) -> np.ndarray:
+        scores = np.zeros(len(starts), dtype=np.int8)
+        for score, pattern in (
+            (1, SENTENCE_BREAK),
+            (2, LINE_BREAK),
+            (3, PARAGRAPH_BREAK),
+        ):
+            positions = [match.start() for match in pattern.finditer(buffer)]
+            if not positions:
+                continue
+            # the break belongs to the last token starting at or before it
+            tokens = np.searchsorted(starts, positions, side="right") - 1
+            np.maximum.at(scores, tokens[tokens >= 0], score)
+        return scores
+
+    def _cut(self, scores: np.ndarray) -> list[tuple[int, int]]:
+        """Token ranges [first, last] of every chunk."""
+        count, ranges, first = len(scores), [], 0
+        while first < count:
+            stop = min(first + self.max_tokens, count)
+            if stop == count:
+                last = count - 1
+            else:
+                # best break in the back half, the latest one on ties
+                lo = first + self.max_tokens // 2
+                window = scores[lo:stop][::-1]
+                last = stop - 1 - int(np.argmax(window))
+            ranges.append((first, last))
+            if last == count - 1:
+                break
+            first = max(last + 1 - self.overlap_tokens, first + 1)
+        return ranges
+
+    def split_documents(self, pages: list[Document]) -> list[Document]:
+        """Chunk consecutive pages, chunks may run across page boundaries."""
+        if not pages:
+            return []
+        buffer = PAGE_SEPARATOR.join(page.page_content for page in pages)
+        lengths = np.array([len(page.page_content) for page in pages])
+        page_offsets = np.concatenate(
+            ([0], np.cumsum(lengths[:-1] + len(PAGE_SEPARATOR)))
+        )
+
+        starts, ends = self._token_spans(buffer)
+        if not len(starts):
+            return []
+        ranges = self._cut(self._break_scores(buffer, starts))
+
+        first, last = np.array(ranges).T
+        char_starts, char_ends = starts[first], ends[last]
+        start_pages = np.searchsorted(page_offsets, char_starts, side="right") - 1
+        end_pages = np.searchsorted(page_offsets, char_ends - 1, side="right") - 1
+
+        chunks = []
+        for char_start, char_end, start_page, end_page in zip(
+            char_starts.tolist(),
+            char_ends.tolist(),
+            start_pages.tolist(),
+            end_pages.tolist(),
+        ):
+            metadata = {
+                **pages[start_page].metadata,
+                "page_end": pages[end_page].metadata["page"],
+                "char_start": char_start - int(page_offsets[start_page]),
+                "char_end": char_end - int(page_offsets[end_page]),
+            }
+            chunks.append(
+                Document(page_content=buffer[char_start:char_end], metadata=metadata)
+            )
+        return chunks
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
+
+import httpx
+import numpy as np
+from cohere import AsyncClientV2
+
+from sliderblend.internal.services.batching import AdaptiveBatcher
+from sliderblend.internal.services.embedding import (
+    EMBEDDING_MODEL_NAME,
+    embed_query,
+    embed_texts,
+)
+from sliderblend.pkg import (
+    BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
+    CohereSettings,
+    EmbedderSettings,
+    get_logger,
+)
+from sliderblend.pkg.types import Error
+
+if TYPE_CHECKING:
+    from sliderblend.pkg.types import Embedder, error
+
+logger = get_logger(__name__)
+
+# what the embedder is asked for under each EMBEDDER_STORAGE option
+EMBEDDING_TYPES = {
+    "vector": "float",
+    "halfvec": "float",
+    "int8": "int8",
+    "binary": "ubinary",
+}
+
+
+def quantize(vectors: np.ndarray, embedding_type: str) -> List[List[float]]:
+    """
+    Quantize float vectors locally the way cohere does server side, int8
+    scales each vector into -127..127 and ubinary keeps the sign bit.
+    """
+    if embedding_type == "int8":
+        scale = np.abs(vectors).max(axis=1, keepdims=True)
+        vectors = np.rint(vectors / np.where(scale == 0, 1, scale) * 127)
+    elif embedding_type == "ubinary":
+        vectors = (vectors > 0).astype(np.uint8)
+    return vectors.tolist()
+
+
+class CohereEmbedder:
+    """Cohere embed API, batches are sized by the shared AdaptiveBatcher."""
+
+    name = EMBEDDING_MODEL_NAME
+    dimensions = EMBEDDING_DIMENSIONS
+
+    def __init__(
+        self,
+        client: AsyncClientV2,
+        *,
+        batcher: Optional[AdaptiveBatcher] = None,
+        batch_size: int = BATCH_SIZE,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        embedding_type: str = "float",
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.client = client
+        self.embedding_type = embedding_type
+        self.batcher = batcher or AdaptiveBatcher(max_texts=batch_size)
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._http_client = http_client
+
+    @classmethod
+    def from_settings(
+        cls, settings: CohereSettings, embedding_type: str = "float"
+    ) -> CohereEmbedder:
+        # the batcher reads rate limit headers off every response
+        batcher = AdaptiveBatcher.from_settings(settings)
+        # cohere drops its own default timeout when given an httpx client
+        http_client = httpx.AsyncClient(
+            timeout=settings.cohere_timeout,
+            event_hooks={"response": [batcher.observe_response]},
+        )
+        client = AsyncClientV2(
+            settings.cohere_api_key,
+            timeout=settings.cohere_timeout,
+            httpx_client=http_client,
+        )
+        return cls(
+            client,
+            batcher=batcher,
+            max_concurrency=settings.cohere_max_concurrency,
+            max_retries=settings.cohere_max_retries,
+            embedding_type=embedding_type,
+            http_client=http_client,
+        )
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await embed_texts(
+            self.client,
+            document=texts,
+            batch_size=self.batch_size,
+            max_concurrency=self.max_concurrency,
+            max_retries=self.max_retries,
+            batcher=self.batcher,
+            embedding_type=self.embedding_type,
+        )
+
+    async def embed_query(self, text: str) -> List[float]:
+        return await embed_query(self.client, text, max_retries=self.max_retries)
+
+    async def close(self) -> None:
+        if self._http_client is not None:
+            await self._http_client.aclose()
+
+
+class LocalEmbedder:
+    """
+    sentence-transformers model on this machine, torch or onnx.
+
+    The model is loaded on first use. A call is split into one slice per
+    worker thread, the runtimes release the GIL while encoding so the
+    slices run in parallel on one shared model.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        backend: str = "onnx",
+        device: str = "cpu",
+        workers: int = 1,
+        batch_size: int = 32,
+        query_prompt: str = "",
+        embedding_type: str = "float",
+    ) -> None:
+        try:
+            import sentence_transformers  # noqa: F401
+        except ImportError as e:
+            raise Error(
+                "The local embedder needs sentence-transformers, "
+                "pip install 'sentence-transformers[onnx]'"
+            ) from e
+        self.name = model_name
+        self.dimensions = EMBEDDING_DIMENSIONS
+        self.embedding_type = embedding_type
+        self.backend = backend
+        self.device = device
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.query_prompt = query_prompt
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="embedder"
+        )
+
+    @classmethod
+    def from_settings(cls, settings: EmbedderSettings) -> LocalEmbedder:
+        return cls(
+            settings.embedder_local_model,
+            backend=settings.embedder_local_backend,
+            device=settings.embedder_local_device,
+            workers=settings.embedder_local_workers,
+            batch_size=settings.embedder_local_batch_size,
+            query_prompt=settings.embedder_local_query_prompt,
+            embedding_type=EMBEDDING_TYPES[settings.embedder_storage],
+        )
+
+    def _get_model(self):
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+
+                logger.info("Loading %s (%s)", self.name, self.backend)
+                model = SentenceTransformer(
+                    self.name, device=self.device, backend=self.backend
+                )
+                dimensions = model.get_sentence_embedding_dimension()
+                if dimensions != self.dimensions:
+                    raise Error(
+                        f"{self.name} makes {dimensions} dim vectors, "
+                        f"the embeddings table holds {self.dimensions}"
+                    )
+                self._model = model
+            return self._model
+
+    def _encode(
+        self, texts: List[str], prompt: Optional[str], embedding_type: str
+    ) -> List[List[float]]:
+        vectors = self._get_model().encode(
+            texts,
+            batch_size=self.batch_size,
+            prompt=prompt or None,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return quantize(vectors, embedding_type)
+
+    async def _run(
+        self, texts: List[str], prompt: Optional[str], embedding_type: str
+    ) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        size = max(1, math.ceil(len(texts) / self.workers))
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor,
+                    self._encode,
+                    texts[i : i + size],
+                    prompt,
+                    embedding_type,
+                )
+                for i in range(0, len(texts), size)
+            )
+        )
+        return [vector for result in results for vector in result]
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._run(texts, None, self.embedding_type)
+
+    async def embed_query(self, text: str) -> List[float]:
+        return (await self._run([text], self.query_prompt, "float"))[0]
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class FakeEmbedder:
+    """
+    Deterministic stand-in for offline runs, benchmarks and load tests.
+
+    Every text maps to a unit vector seeded from its hash, the same text
+    always gets the same vector and a query equal to a chunk scores 1.
+    """
+
+    dimensions = EMBEDDING_DIMENSIONS
+
+    def __init__(self, latency: float = 0.0, embedding_type: str = "float") -> None:
+        self.name = f"fake-{self.dimensions}"
+        self.latency = latency
+        self.embedding_type = embedding_type
+
+    def vector(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.blake2b(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions)
+        return vector / np.linalg.norm(vector)
+
+    async def _embed(self, texts: List[str], embedding_type: str) -> List[List[float]]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        vectors = np.array([self.vector(text) for text in texts])
+        return quantize(vectors.reshape(len(texts), self.dimensions), embedding_type)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self._embed(texts, self.embedding_type)
+
+    async def embed_query(self, text: str) -> List[float]:
+        return (await self._embed([text], "float"))[0]
+
+    async def close(self) -> None:
+        return None
+
+
+class CoalescingEmbedder:
+    """
+    Pool embed_documents calls from every job in the process into shared
+    requests.
+
+    Texts wait up to max_delay seconds for others to arrive and go out as
+    soon as max_texts are queued, duplicates within a batch are embedded
+    once. At most max_concurrency batches are in flight process wide.
+    Each caller gets its own vectors back in order through futures. A batch
+    that fails after the inner embedder's retries is sent again one caller
+    at a time, so only the call that owns a bad text fails. Queries are
+    latency sensitive and skip the queue.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        max_texts: int = BATCH_SIZE,
+        max_delay: float = 0.005,
+        max_concurrency: int = 8,
+    ) -> None:
+        self.embedder = embedder
+        self.name = embedder.name
+        self.dimensions = embedder.dimensions
+        self.embedding_type = embedder.embedding_type
+        self.max_texts = max_texts
+        self.max_delay = max_delay
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # text, its future and the embed_documents call it came from
+        self._pending: list[tuple[str, asyncio.Future, object]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def _schedule(self) -> None:
+        if self._pending and self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_delay, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = self._pending[: self.max_texts]
+        self._pending = self._pending[self.max_texts :]
+        if batch:
+            task = asyncio.create_task(self._dispatch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        self._schedule()
+
+    async def _dispatch(
+        self, batch: list[tuple[str, asyncio.Future, object]]
+    ) -> None:
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            async with self._slots:
+                vectors = dict(
+                    zip(texts, await self.embedder.embed_documents(texts))
+                )
+        except Exception as e:
+            callers: dict[int, list] = {}
+            for item in batch:
+                callers.setdefault(id(item[2]), []).append(item)
+            if len(callers) == 1:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            logger.warning(
+                "Coalesced batch failed, retrying its %d calls apart: %s",
+                len(callers),
+                e,
+            )
+            await asyncio.gather(*(self._dispatch(items) for items in callers.values()))
+            return
+        logger.debug("Coalesced %d texts into one batch", len(batch))
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(vectors[text])
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        self._pending.extend(
+            (text, future, futures) for text, future in zip(texts, futures)
+        )
+        while len(self._pending) >= self.max_texts:
+            self._flush()
+        self._schedule()
+        try:
+            return list(await asyncio.gather(*futures))
+        except BaseException:
+            # mark the rest as retrieved, one failed text fails the call
+            for future in futures:
+                if future.done() and not future.cancelled():
+                    future.exception()
+            raise
+
+    async def embed_query(self, text: str) -> List[float]:
+        return await self.embedder.embed_query(text)
+
+    async def close(self) -> None:
+        while self._pending:
+            self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.embedder.close()
+
+
+def get_embedder(
+    settings: Optional[EmbedderSettings] = None,
+    cohere_settings: Optional[CohereSettings] = None,
+) -> tuple[Embedder, error]:
+    settings = settings or EmbedderSettings()
+    backend = settings.embedder_backend.lower()
+    embedding_type = EMBEDDING_TYPES[settings.embedder_storage]
+    logger.info("Creating %s embedder (%s)", backend, embedding_type)
+    try:
+        if backend == "cohere":
+            cohere_settings = cohere_settings or CohereSettings()
+            embedder = CohereEmbedder.from_settings(cohere_settings, embedding_type)
+        elif backend == "local":
+            embedder = LocalEmbedder.from_settings(settings)
+        elif backend == "fake":
+            embedder = FakeEmbedder(settings.embedder_fake_latency, embedding_type)
+        else:
+            return None, Error(f"Unsupported embedder: {backend}")
+    except Error as e:
+        return None, e
+    if settings.embedder_coalesce_delay > 0:
+        embedder = CoalescingEmbedder(
+            embedder,
+            max_delay=settings.embedder_coalesce_delay,
+            max_concurrency=settings.embedder_coalesce_max_concurrency,
+        )
+    return embedder, None
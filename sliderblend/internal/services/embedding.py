@@ -1,61 +1,351 @@
 from __future__ import annotations
 
+import asyncio
 import io
-from typing import IO, List, Union
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import IO, TYPE_CHECKING, Iterator, List, Optional, Union
 
 import fitz
+import httpx
+import numpy as np
 from cohere import AsyncClient, Client
+from cohere.core.api_error import ApiError
 from langchain_community.embeddings.cohere import CohereEmbeddings
 from langchain_core.documents import Document
 
+from sliderblend.internal.services.batching import AdaptiveBatcher, estimate_tokens
 from sliderblend.pkg import CohereSettings, get_logger
 from sliderblend.pkg.types import Error, error
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from sliderblend.internal import EmbeddingCache
+    from sliderblend.pkg.types import Embedder
+
 cohere_settings = CohereSettings()
 logger = get_logger(__name__)
 
 type EMBEDDING_MODEL = Union[Client, AsyncClient]
 
+EMBEDDING_MODEL_NAME = "embed-english-v3.0"
+RETRY_BACKOFF = 0.5  # seconds, doubled on every attempt
+
 
 class LoadPDF:
     def __init__(self, name: str, source: Union[str, IO[bytes]]) -> None:
         self.source = source
         self.name = name
 
+    def _open(self) -> tuple[fitz.Document, error]:
+        try:
+            if isinstance(self.source, (str, os.PathLike)):
+                return fitz.open(self.source, filetype="pdf"), None
+            if not isinstance(self.source, io.IOBase):
+                err = Error("Error: Only supports io.IOBase or a file path")
+                return None, err
+            self.source.seek(0)
+            return fitz.open(stream=self.source, filetype="pdf"), None
+        except (fitz.FileDataError, RuntimeError) as e:
+            # corrupt or not a pdf, retrying will not help
+            return None, Error(f"Could not open {self.name}: {e}")
+
+    def page_count(self) -> tuple[int, error]:
+        doc, err = self._open()
+        if err:
+            return 0, err
+        with doc:
+            return doc.page_count, None
+
+    def lazy_load(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> tuple[Iterator[Document], error]:
+        """Yield pages start..stop one at a time instead of the whole document."""
+        doc, err = self._open()
+        if err:
+            return None, err
+
+        def pages() -> Iterator[Document]:
+            with doc:
+                for i in range(start, min(stop or doc.page_count, doc.page_count)):
+                    text = doc[i].get_text()
+                    metadata = {"source": self.name, "page": i + 1}
+                    yield Document(page_content=text, metadata=metadata)
+
+        return pages(), None
+
     def load(self) -> tuple[list[Document], error]:
-        docs = []
+        pages, err = self.lazy_load()
+        if err:
+            return None, err
+        return list(pages), None
+
+    def parallel_load(
+        self,
+        executor: Executor,
+        shards: Optional[int] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
+    ) -> tuple[list[Document], error]:
+        """
+        Extract pages start..stop with the page ranges spread over executor.
 
+        Every shard reopens the document from a file, in memory sources are
+        spooled to a temp file first. Pages are returned in document order.
+        """
+        if isinstance(self.source, (str, os.PathLike)):
+            return _load_shards(self.name, self.source, executor, shards, start, stop)
         if not isinstance(self.source, io.IOBase):
-            err = Error("Error: Only supports io.IOBase")
+            err = Error("Error: Only supports io.IOBase or a file path")
             return None, err
 
-        doc = fitz.open(stream=self.source, filetype="pdf")
-        for i, page in enumerate(doc):
-            text = page.get_text()
-            metadata = {"source": self.name, "page": i+1}
-            docs.append(Document(page_content=text, metadata=metadata))
-        return docs, None
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as spool:
+            self.source.seek(0)
+            shutil.copyfileobj(self.source, spool)
+            spool.flush()
+            return _load_shards(self.name, spool.name, executor, shards, start, stop)
 
 
-async def embed_document(
-    embedding_model: EMBEDDING_MODEL, *, document: List[str], batch_size: int
-):
-    all_embeddings = []
+def page_ranges(start: int, stop: int, shards: int) -> list[tuple[int, int]]:
+    """Split start..stop into at most shards contiguous ranges."""
+    size = max(1, math.ceil((stop - start) / max(1, shards)))
+    return [(i, min(i + size, stop)) for i in range(start, stop, size)]
+
+
+def load_page_range(
+    name: str, path: Union[str, os.PathLike], start: int, stop: int
+) -> tuple[list[Document], error]:
+    """Extract one shard, module level so it can run in a process pool."""
+    pages, err = LoadPDF(name=name, source=path).lazy_load(start, stop)
+    if err:
+        return None, err
+    try:
+        return list(pages), None
+    except RuntimeError as e:
+        return None, Error(f"Could not read pages {start + 1}-{stop} of {name}: {e}")
 
-    # Split document into batches
-    batches = [
-        document[i : i + batch_size] for i in range(0, len(document), batch_size)
+
+def _load_shards(
+    name: str,
+    path: Union[str, os.PathLike],
+    executor: Executor,
+    shards: Optional[int],
+    start: int,
+    stop: Optional[int],
+) -> tuple[list[Document], error]:
+    if stop is None:
+        stop, err = LoadPDF(name=name, source=path).page_count()
+        if err:
+            return None, err
+    futures = [
+        executor.submit(load_page_range, name, path, shard_start, shard_stop)
+        for shard_start, shard_stop in page_ranges(
+            start, stop, shards or os.cpu_count() or 1
+        )
     ]
-    logger.info("Starting embedding")
-    for batch in batches:
-        logger.info("Starting embedding on batch")
-        embeddings = await embedding_model.embed(
-            model="embed-english-v3.0",
-            input_type="search_document",
-            embedding_types=["float"],
-            texts=batch,
+    docs = []
+    for future in futures:
+        pages, err = future.result()
+        if err:
+            return None, err
+        docs.extend(pages)
+    return docs, None
+
+
+def _is_rate_limited(exc: Exception) -> bool:
+    return isinstance(exc, ApiError) and exc.status_code == 429
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.TimeoutException):
+        return True
+    if isinstance(exc, ApiError):
+        return exc.status_code == 429 or (exc.status_code or 0) >= 500
+    return False
+
+
+async def _embed_batch(
+    embedding_model: EMBEDDING_MODEL,
+    batch: List[str],
+    *,
+    index: int,
+    max_retries: int,
+    input_type: str = "search_document",
+    embedding_type: str = "float",
+    batcher: Optional[AdaptiveBatcher] = None,
+    tokens: int = 0,
+) -> List[List[float]]:
+    for attempt in range(max_retries + 1):
+        if batcher is not None:
+            await batcher.wait()
+        start = time.perf_counter()
+        try:
+            embeddings = await embedding_model.embed(
+                model=EMBEDDING_MODEL_NAME,
+                input_type=input_type,
+                embedding_types=[embedding_type],
+                texts=batch,
+            )
+        except Exception as e:
+            if batcher is not None and not _is_rate_limited(e) and _is_retryable(e):
+                # timeouts and server errors usually mean the batch was too big
+                batcher.shrink()
+            if not _is_retryable(e) or attempt == max_retries:
+                raise
+            # back off while holding the slot so a rate limited provider
+            # sees fewer requests, not the same number retried sooner
+            delay = RETRY_BACKOFF * 2**attempt + random.uniform(0, RETRY_BACKOFF)
+            if batcher is not None:
+                delay = max(delay, batcher.paused_for)
+            logger.warning(
+                "Embedding batch %d failed (%s), retrying in %.2fs",
+                index + 1,
+                e,
+                delay,
+            )
+            await asyncio.sleep(delay)
+            continue
+        elapsed = time.perf_counter() - start
+        if batcher is not None:
+            batcher.observe(tokens=tokens, latency=elapsed)
+        logger.info(
+            "Embedded batch %d: %d texts, ~%d tokens in %.2fs (attempt %d)",
+            index + 1,
+            len(batch),
+            tokens,
+            elapsed,
+            attempt + 1,
         )
-        all_embeddings.extend(embeddings.embeddings.float)
+        vectors = getattr(embeddings.embeddings, embedding_type)
+        if embedding_type == "ubinary":
+            # packed 8 dimensions a byte, unpack to one 0/1 per dimension
+            packed = np.asarray(vectors, dtype=np.uint8)
+            return np.unpackbits(packed, axis=1).tolist()
+        return vectors
+
+
+async def embed_texts(
+    embedding_model: EMBEDDING_MODEL,
+    *,
+    document: List[str],
+    batch_size: int,
+    max_concurrency: int,
+    max_retries: int,
+    batcher: Optional[AdaptiveBatcher] = None,
+    embedding_type: str = "float",
+) -> List[List[float]]:
+    """
+    Embed document with cohere in token sized batches, in input order.
+    embedding_type is float, int8 or ubinary, ubinary comes back unpacked.
+    """
+    batcher = batcher or AdaptiveBatcher(max_texts=batch_size)
+    tokens = [estimate_tokens(text) for text in document]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    logger.info(
+        "Starting embedding, %d texts, ~%d tokens with %d in flight",
+        len(document),
+        sum(tokens),
+        max_concurrency,
+    )
+    start = time.perf_counter()
+
+    async def run(index: int, first: int, count: int) -> List[List[float]]:
+        try:
+            return await _embed_batch(
+                embedding_model,
+                document[first : first + count],
+                index=index,
+                max_retries=max_retries,
+                embedding_type=embedding_type,
+                batcher=batcher,
+                tokens=sum(tokens[first : first + count]),
+            )
+        finally:
+            semaphore.release()
 
-    logger.info("Done embedding")
+    tasks: list[asyncio.Task] = []
+    position = 0
+    try:
+        while position < len(document):
+            # each batch is sized when a slot frees up, so it uses the budget
+            # adjusted by the requests that finished before it
+            await semaphore.acquire()
+            if any(task.done() and task.exception() for task in tasks):
+                semaphore.release()
+                break
+            count = batcher.next_batch(tokens, position, max_texts=batch_size)
+            tasks.append(asyncio.create_task(run(len(tasks), position, count)))
+            position += count
+        # gather keeps results in batch order, so chunks line up with their vectors
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    all_embeddings = [vector for result in results for vector in result]
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        "Done embedding %d texts in %d batches in %.2fs (%.0f texts/s)",
+        len(document),
+        len(tasks),
+        elapsed,
+        len(document) / elapsed if elapsed else 0,
+    )
     return all_embeddings
+
+
+async def embed_query(
+    embedding_model: EMBEDDING_MODEL,
+    query: str,
+    *,
+    max_retries: int = cohere_settings.cohere_max_retries,
+) -> List[float]:
+    """Embed a search query, cohere v3 models embed queries and documents
+    differently so this must not share the document cache."""
+    embeddings = await _embed_batch(
+        embedding_model,
+        [query],
+        index=0,
+        max_retries=max_retries,
+        input_type="search_query",
+    )
+    return embeddings[0]
+
+
+async def embed_document(
+    embedder: Embedder,
+    *,
+    document: List[str],
+    cache: Optional[EmbeddingCache] = None,
+) -> List[List[float]]:
+    """
+    Embed every text of document in order, with any Embedder backend.
+    Texts already in cache are not sent again, the cache should be
+    namespaced by embedder.name so backends never share vectors.
+    """
+    if cache is None:
+        return await embedder.embed_documents(document)
+
+    # only texts that were never embedded go to the embedder, and only once each
+    unique_texts = list(dict.fromkeys(document))
+    cached = await cache.get_many(unique_texts)
+    vectors = dict(zip(unique_texts, cached))
+    missing = [text for text, vector in vectors.items() if vector is None]
+    logger.info(
+        "Embedding cache: %d of %d unique chunks cached",
+        len(unique_texts) - len(missing),
+        len(unique_texts),
+    )
+
+    if missing:
+        embeddings = await embedder.embed_documents(missing)
+        await cache.set_many(missing, embeddings)
+        vectors.update(zip(missing, embeddings))
+
+    return [vectors[text] for text in document]
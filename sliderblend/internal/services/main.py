@@ -1,112 +1,263 @@
 from __future__ import annotations
 
+import asyncio
 import re
-from io import BytesIO
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Literal, Optional
 
-from cohere import AsyncClientV2
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document
+from sqlmodel import Session, delete, select, update
 
-from sliderblend.internal import RedisJob, get_storage_provider
+from sliderblend.internal import EmbeddingCache, RedisJob
 from sliderblend.internal.entities import create_document_embedding
+from sliderblend.internal.models import DocumentEmbeddingsModel, DocumentsModel
 from sliderblend.internal.schemas import CreateDocumentEmbeddingSchema
-from sliderblend.internal.services.embedding import LoadPDF, embed_document
+from sliderblend.internal.services.chunking import TokenChunker
+from sliderblend.internal.services.embedders import get_embedder
+from sliderblend.internal.storage import get_async_storage_provider, spool_download
+from sliderblend.internal.services.embedding import (
+    LoadPDF,
+    embed_document,
+    load_page_range,
+    page_ranges,
+)
 from sliderblend.pkg import (
-    BATCH_SIZE,
+    PAGE_WINDOW,
+    ChunkSettings,
     CohereSettings,
+    EmbedderSettings,
     FilebaseSettings,
     RedisSettings,
+    WorkerSettings,
     get_logger,
-    get_session,
 )
-from sliderblend.pkg.types import PROCESS_STATE, StorageProvider
+from sliderblend.pkg.db import engine
+from sliderblend.pkg.types import PROCESS_STATE, AsyncStorageProvider, Error
 
 if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
     from sliderblend.internal import RedisJob
     from sliderblend.pkg.types import Job, error
 
 logger = get_logger(__name__)
 
-RECURSIVESPLITTER = RecursiveCharacterTextSplitter(
-    ["\n\n", "\n", "."], chunk_size=500, chunk_overlap=50
-)
-
+chunk_settings = ChunkSettings()
 cohere_settings = CohereSettings()
+embedder_settings = EmbedderSettings()
 redis_settings = RedisSettings()
 filebase_settings = FilebaseSettings()
+worker_settings = WorkerSettings()
+
+CHUNKER = TokenChunker.from_settings(chunk_settings)
 
 redis_job = RedisJob(redis_settings)
-cohere_client = AsyncClientV2(cohere_settings.cohere_api_key)
-session = get_session()
+# one embedder per worker, every job shares its client and, for cohere,
+# the batch sizes learned from the same rate limits
+embedder, err = get_embedder(embedder_settings, cohere_settings)
+if err:
+    raise err
+# quantized vectors are cached apart from the float ones of the same model
+embedding_cache = EmbeddingCache(
+    redis_settings,
+    embedder.name
+    if embedder.embedding_type == "float"
+    else f"{embedder.name}-{embedder.embedding_type}",
+)
+
+
+def parse_pages(
+    file_name: str, path: str, start: int, stop: int
+) -> tuple[list[Document], error]:
+    """Load and chunk a page range of a pdf, module level so it can run in a
+    process pool."""
+    pages, err = load_page_range(file_name, path, start, stop)
+    if err:
+        return None, err
+    return CHUNKER.split_documents(pages), None
+
+
+async def _parse_window(
+    file_name: str, path: str, start: int, stop: int, executor: Optional[Executor]
+) -> tuple[list[Document], error]:
+    # every shard reopens the file in its own process, chunks come back in
+    # page order
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                executor, parse_pages, file_name, path, shard_start, shard_stop
+            )
+            for shard_start, shard_stop in page_ranges(
+                start, stop, worker_settings.worker_page_shards
+            )
+        )
+    )
+    chunked_document = []
+    for chunks, err in results:
+        if err:
+            return None, err
+        chunked_document.extend(chunks)
+    return chunked_document, None
+
+
+def _claim_document(session: Session, document_id) -> bool:
+    """
+    Lock the document row for this transaction and clear rows left by an
+    earlier attempt, False when the document is already embedded.
+
+    A redelivered job waits here until the run holding the lock commits or
+    rolls back, so two runs never write the same document.
+    """
+    document = session.exec(
+        select(DocumentsModel)
+        .where(DocumentsModel.id == document_id)
+        .with_for_update()
+    ).first()
+    if document is None or document.is_embedded:
+        return False
+    session.exec(
+        delete(DocumentEmbeddingsModel).where(
+            DocumentEmbeddingsModel.document_id == document_id
+        )
+    )
+    return True
+
+
+async def _embed_pages(
+    job: Job,
+    file_name: str,
+    path: str,
+    page_count: int,
+    executor: Optional[Executor],
+) -> error:
+    """
+    Parse, embed and save the document PAGE_WINDOW pages at a time.
+
+    Only one window of chunks and vectors is held in memory, every window is
+    written as soon as it is embedded and the whole document is committed
+    at the end along with the document's chunk count, which search uses to
+    pick between an exact scan and the hnsw index. A document that is
+    already embedded is skipped.
+    """
+    session = Session(engine)
+    chunk_count = 0
+    try:
+        document_id = job.metadata["document_id"]
+        if not await asyncio.to_thread(_claim_document, session, document_id):
+            logger.info("job %s: Document already embedded", job.job_id)
+            return None
+        for start in range(0, page_count, PAGE_WINDOW):
+            stop = min(start + PAGE_WINDOW, page_count)
+            logger.info("job %s: Pages %d-%d", job.job_id, start + 1, stop)
+            # parsing and splitting are cpu bound, keep them off the event loop
+            chunked_document, err = await _parse_window(
+                file_name, path, start, stop, executor
+            )
+            if err:
+                return err
+            if not chunked_document:
+                continue
+
+            embeddings = await embed_document(
+                embedder,
+                document=[chunk.page_content for chunk in chunked_document],
+                cache=embedding_cache,
+            )
+            document_embedding = CreateDocumentEmbeddingSchema(
+                document=chunked_document,
+                embedding=embeddings,
+                document_id=document_id,
+                storage=embedder_settings.embedder_storage,
+            )
+            err = await asyncio.to_thread(
+                create_document_embedding, schema=document_embedding, db=session
+            )
+            if err:
+                return err
+            chunk_count += len(chunked_document)
+
+        logger.info("job %s: Saving %d embeddings", job.job_id, chunk_count)
+        await asyncio.to_thread(
+            session.exec,
+            update(DocumentsModel)
+            .where(DocumentsModel.id == document_id)
+            .values(
+                chunk_count=chunk_count,
+                is_embedded=True,
+                embedding_storage=embedder_settings.embedder_storage,
+            ),
+        )
+        await asyncio.to_thread(session.commit)
+        return None
+    finally:
+        await asyncio.to_thread(session.close)
 
 
 # TODO get file type
-async def embed(storage_provider: StorageProvider, job: Job) -> error:
+async def embed(
+    storage_provider: AsyncStorageProvider,
+    job: Job,
+    executor: Optional[Executor] = None,
+) -> error:
+    """
+    Run a job end to end, returns an error when it should be retried.
+
+    Failures caused by the document itself mark the job failed and return
+    None, anything unexpected leaves the job as it is so the message stays
+    pending and another worker picks it up after the visibility timeout,
+    until the job runs out of deliveries.
+    """
     try:
         logger.info("job %s: Processing ", job.job_id)
         job.process_state = PROCESS_STATE.EMBEDDING
-        metadata = job.metadata
-        document_id = metadata["document_id"]
-        docuemnt_key = metadata["file_key"]
+        docuemnt_key = job.metadata["file_key"]
         docuemnt_key = f"documents/{docuemnt_key}"
         file_name = re.sub(r"^.*[/:]", "", docuemnt_key)
-        buffer = BytesIO()
 
         await redis_job.update_job(job)
-        logger.info("job %s: Downloading document bytes", job.job_id)
-        _, err = storage_provider.download_bytes(docuemnt_key, buffer)  # bytes
-        if err:
-            job.process_state = PROCESS_STATE.FAILED
-            _ = await redis_job.update_job(job)
-            logger.error(
-                "job %s: Could not download document bytes, %s",
-                job.job_id,
-                err.message,
-            )
-            return
-        logger.info("job %s: Embedding document", job.job_id)
-
-        loader = LoadPDF(name=file_name, source=buffer)
-        load_documents, err = loader.load()
-        if err:
-            logger.error(err.message)
-            return
-        chunked_document = RECURSIVESPLITTER.split_documents(load_documents)
-
-        embeddings = await embed_document(
-            cohere_client,
-            document=[chunk.page_content for chunk in chunked_document],
-            batch_size=BATCH_SIZE,
-        )
-        document_embedding = CreateDocumentEmbeddingSchema(
-            document=chunked_document, embedding=embeddings, document_id=document_id
-        )
-        logger.info("job %s: Saving embeddings", job.job_id)
-        err = create_document_embedding(schema=document_embedding, db=session)
+        logger.info("job %s: Downloading document", job.job_id)
+        # the document is streamed to disk, parser processes open the file
+        # instead of each job holding the whole pdf in memory
+        async with spool_download(
+            storage_provider, docuemnt_key, worker_settings.worker_spool_dir
+        ) as (path, err):
+            if err:
+                job.process_state = PROCESS_STATE.FAILED
+                _ = await redis_job.update_job(job)
+                logger.error(
+                    "job %s: Could not download document, %s",
+                    job.job_id,
+                    err.message,
+                )
+                return None
+            logger.info("job %s: Embedding document", job.job_id)
+            page_count, err = LoadPDF(name=file_name, source=path).page_count()
+            if not err:
+                err = await _embed_pages(job, file_name, path, page_count, executor)
         if err:
             job.process_state = PROCESS_STATE.FAILED
             _ = await redis_job.update_job(job)
-            logger.error(
-                "job %s: %s",
-                job.job_id,
-                err.message,
-            )
-            return
+            logger.error("job %s: %s", job.job_id, err.message)
+            return None
         job.process_state = PROCESS_STATE.COMPLETED
         await redis_job.update_job(job)
         logger.info("job %s: Done", job.job_id)
-        session.commit()
+        return None
     except Exception as e:
         logger.error(e, stack_info=True)
+        return Error(f"job {job.job_id}: {e}")
 
 
-async def start_chunkning_process(obj_store: Literal["filebase", "ibm"], job: Job):
+async def start_chunkning_process(
+    obj_store: Literal["filebase", "ibm"],
+    job: Job,
+    executor: Optional[Executor] = None,
+) -> error:
     logger.info("Received job %s", job.job_id)
-    storage_provider, err = get_storage_provider(obj_store, filebase_settings)
+    storage_provider, err = get_async_storage_provider(obj_store, filebase_settings)
     if err:
         logger.error(err.message)
-        return
+        return err
 
     logger.info("Starting job %s", job.job_id)
-    await embed(storage_provider, job)
-    return
+    return await embed(storage_provider, job, executor)
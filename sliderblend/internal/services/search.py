@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+from pgvector.sqlalchemy import BIT
+from sqlalchemy import cast, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import select
+
+from sliderblend.internal.models import DocumentEmbeddingsModel, DocumentsModel
+from sliderblend.internal.schemas import SearchResultSchema
+from sliderblend.pkg import EMBEDDING_DIMENSIONS, SearchSettings, get_logger
+from sliderblend.pkg.types import Error
+
+if TYPE_CHECKING:
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    from sliderblend.pkg.types import Embedder, error
+
+logger = get_logger(__name__)
+search_settings = SearchSettings()
+
+
+async def set_ef_search(session: AsyncSession, ef_search: int) -> None:
+    """Set hnsw.ef_search for the session's current transaction only."""
+    connection = await session.connection()
+    await connection.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+        {"ef_search": str(ef_search)},
+    )
+
+
+async def set_iterative_scan(session: AsyncSession, mode: str) -> None:
+    """
+    Let the hnsw scan keep walking the graph until the document filter has
+    k matches, instead of returning short (pgvector >= 0.8).
+    """
+    connection = await session.connection()
+    await connection.execute(
+        text("SELECT set_config('hnsw.iterative_scan', :mode, true)"),
+        {"mode": mode},
+    )
+
+
+async def get_document_index(
+    session: AsyncSession, document_id: UUID
+) -> tuple[int, str]:
+    """Chunk count and embedding storage of a document, they pick the plan."""
+    statement = select(
+        DocumentsModel.chunk_count, DocumentsModel.embedding_storage
+    ).where(DocumentsModel.id == document_id)
+    row = (await session.exec(statement)).first()
+    return (row.chunk_count, row.embedding_storage) if row else (0, "vector")
+
+
+def _distance(column, storage: str, query_embedding: list[float]):
+    if storage == "binary":
+        bits = "".join("1" if value > 0 else "0" for value in query_embedding)
+        return column.hamming_distance(cast(bits, BIT(EMBEDDING_DIMENSIONS)))
+    return column.cosine_distance(query_embedding)
+
+
+def _score(distance: float, storage: str) -> float:
+    if storage == "binary":
+        return 1 - distance / EMBEDDING_DIMENSIONS
+    return 1 - distance
+
+
+def _exact_statement(
+    query_embedding: list[float], document_id: UUID, k: int, storage: str = "vector"
+):
+    # materializing the filtered rows keeps the planner on the document_id
+    # btree, every chunk of the document is then ranked exactly
+    chunks = (
+        select(
+            DocumentEmbeddingsModel.id,
+            DocumentEmbeddingsModel.text,
+            DocumentEmbeddingsModel.page_number,
+            DocumentEmbeddingsModel.page_end,
+            DocumentEmbeddingsModel.char_start,
+            DocumentEmbeddingsModel.char_end,
+            DocumentEmbeddingsModel.embedding_column(storage).label("embedding"),
+        )
+        .where(DocumentEmbeddingsModel.document_id == document_id)
+        .cte("chunks")
+        .prefix_with("MATERIALIZED")
+    )
+    distance = _distance(chunks.c.embedding, storage, query_embedding).label(
+        "distance"
+    )
+    return (
+        select(
+            chunks.c.id,
+            chunks.c.text,
+            chunks.c.page_number,
+            chunks.c.page_end,
+            chunks.c.char_start,
+            chunks.c.char_end,
+            distance,
+        )
+        .order_by(distance)
+        .limit(k)
+    )
+
+
+def _ann_statement(
+    query_embedding: list[float], document_id: UUID, k: int, storage: str = "vector"
+):
+    # a relaxed_order iterative scan can return rows slightly out of order,
+    # the outer query sorts the k it found by their exact distance
+    distance = _distance(
+        DocumentEmbeddingsModel.embedding_column(storage), storage, query_embedding
+    ).label("distance")
+    nearest = (
+        select(
+            DocumentEmbeddingsModel.id,
+            DocumentEmbeddingsModel.text,
+            DocumentEmbeddingsModel.page_number,
+            DocumentEmbeddingsModel.page_end,
+            DocumentEmbeddingsModel.char_start,
+            DocumentEmbeddingsModel.char_end,
+            distance,
+        )
+        .where(DocumentEmbeddingsModel.document_id == document_id)
+        .order_by(distance)
+        .limit(k)
+        .cte("nearest")
+        .prefix_with("MATERIALIZED")
+    )
+    return select(nearest).order_by(nearest.c.distance)
+
+
+async def search(
+    embedder: Embedder,
+    *,
+    document_id: UUID,
+    query: str,
+    k: Optional[int] = None,
+    session: AsyncSession,
+    ef_search: Optional[int] = None,
+) -> tuple[Optional[list[SearchResultSchema]], error]:
+    """
+    Return the k chunks of a document closest to query.
+
+    The query is embedded by the same backend as the document and ranked by
+    cosine distance, or hamming distance for binary documents. Documents
+    with at most search_exact_max_chunks chunks are scanned exactly through
+    the document_id index, larger ones go through the hnsw index where
+    ef_search trades latency for recall.
+    """
+    k = k or search_settings.search_top_k
+    try:
+        query_embedding = await embedder.embed_query(query)
+    except Exception as e:
+        logger.error("Could not embed query, error: %s", e)
+        return None, Error(f"Could not embed query: {e}")
+
+    try:
+        chunk_count, storage = await get_document_index(session, document_id)
+        if chunk_count <= search_settings.search_exact_max_chunks:
+            statement = _exact_statement(query_embedding, document_id, k, storage)
+        else:
+            statement = _ann_statement(query_embedding, document_id, k, storage)
+            await set_ef_search(
+                session, ef_search or search_settings.search_ef_search
+            )
+            if search_settings.search_iterative_scan:
+                await set_iterative_scan(
+                    session, search_settings.search_iterative_scan
+                )
+        rows = (await session.exec(statement)).all()
+    except SQLAlchemyError as e:
+        await session.rollback()
+        logger.error(e, stack_info=True)
+        return None, Error(e)
+
+    return [
+        SearchResultSchema(
+            id=row.id,
+            text=row.text,
+            page_number=row.page_number,
+            page_end=row.page_end,
+            char_start=row.char_start,
+            char_end=row.char_end,
+            score=_score(row.distance, storage),
+        )
+        for row in rows
+    ], None
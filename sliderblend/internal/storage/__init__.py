@@ -1,3 +1,23 @@
-from sliderblend.internal.storage.factory import get_storage_provider
+from sliderblend.internal.storage.async_storage import (
+    AsyncFilebaseStorage,
+    AsyncS3Storage,
+    LocalStorage,
+    ThreadedStorage,
+)
+from sliderblend.internal.storage.factory import (
+    close_storage_providers,
+    get_async_storage_provider,
+    get_storage_provider,
+)
+from sliderblend.internal.storage.spool import spool_download
 
-__all__ = ["get_storage_provider"]
+__all__ = [
+    "AsyncS3Storage",
+    "AsyncFilebaseStorage",
+    "LocalStorage",
+    "ThreadedStorage",
+    "close_storage_providers",
+    "get_async_storage_provider",
+    "get_storage_provider",
+    "spool_download",
+]
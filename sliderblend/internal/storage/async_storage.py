@@ -0,0 +1,551 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+from contextlib import AsyncExitStack, ExitStack
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple, Union
+
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from sliderblend.pkg import get_logger
+from sliderblend.pkg.types import Error
+
+if TYPE_CHECKING:
+    from aiobotocore.client import AioBaseClient
+
+    from sliderblend.pkg import FilebaseSettings, StorageSettings
+    from sliderblend.pkg.types import StorageProvider
+
+logger = get_logger(__name__)
+
+FILEBASE_ENDPOINT = "https://s3.filebase.com"
+DOWNLOAD_CHUNK = 1024 * 1024
+MIN_PART_SIZE = 5 * 1024**2  # smallest part S3 accepts, bar the last
+PRESIGN_METHODS = {"GET": "get_object", "PUT": "put_object"}
+
+
+def _remaining(source: BinaryIO) -> int:
+    """Bytes left to read from source, -1 if it cannot seek."""
+    try:
+        position = source.tell()
+        end = source.seek(0, os.SEEK_END)
+        source.seek(position)
+    except (AttributeError, OSError, ValueError):
+        return -1
+    return end - position
+
+
+def _full_object_name(object_name: str, folder_path: Optional[str] = None) -> str:
+    if not folder_path:
+        return object_name
+    folder_path = folder_path.strip("/")
+    if folder_path and not folder_path.endswith("/"):
+        folder_path += "/"
+    return f"{folder_path}{object_name}"
+
+
+class AsyncS3Storage:
+    """
+    AsyncStorageProvider for any S3 compatible endpoint.
+
+    All calls share one aiobotocore client, and so one aiohttp connection
+    pool, opened on first use and released by close().
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        *,
+        endpoint_url: str,
+        access_key: str,
+        secret_key: str,
+        max_pool_connections: int = 20,
+        part_size: int = 8 * 1024**2,
+        concurrency: int = 8,
+    ) -> None:
+        self.bucket_name = bucket_name
+        self.endpoint_url = endpoint_url
+        self.part_size = part_size
+        self.concurrency = concurrency
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._config = AioConfig(max_pool_connections=max_pool_connections)
+        self._client: Optional[AioBaseClient] = None
+        self._exit_stack = AsyncExitStack()
+        self._lock = asyncio.Lock()
+
+    async def _get_client(self) -> AioBaseClient:
+        if self._client is None:
+            async with self._lock:
+                if self._client is None:
+                    logger.debug("Creating s3 client for %s", self.endpoint_url)
+                    self._client = await self._exit_stack.enter_async_context(
+                        get_session().create_client(
+                            "s3",
+                            endpoint_url=self.endpoint_url,
+                            aws_access_key_id=self._access_key,
+                            aws_secret_access_key=self._secret_key,
+                            config=self._config,
+                        )
+                    )
+        return self._client
+
+    async def close(self) -> None:
+        await self._exit_stack.aclose()
+        self._client = None
+
+    async def _multipart_upload(
+        self, key: str, source: BinaryIO, part_size: int, concurrency: int
+    ) -> None:
+        client = await self._get_client()
+        upload = await client.create_multipart_upload(Bucket=self.bucket_name, Key=key)
+        upload_id = upload["UploadId"]
+        # a slot is taken before a part is read, at most concurrency parts
+        # are held in memory at once
+        slots = asyncio.Semaphore(concurrency)
+
+        async def send(number: int, body: bytes) -> dict:
+            try:
+                response = await client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=number,
+                    Body=body,
+                )
+                return {"PartNumber": number, "ETag": response["ETag"]}
+            finally:
+                slots.release()
+
+        tasks: list[asyncio.Task] = []
+        try:
+            while True:
+                await slots.acquire()
+                if any(task.done() and task.exception() for task in tasks):
+                    slots.release()
+                    break
+                body = await asyncio.to_thread(source.read, part_size)
+                if not body:
+                    slots.release()
+                    break
+                tasks.append(asyncio.create_task(send(len(tasks) + 1, body)))
+            parts = await asyncio.gather(*tasks)
+            await client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await client.abort_multipart_upload(
+                Bucket=self.bucket_name, Key=key, UploadId=upload_id
+            )
+            raise
+
+    async def upload_to_bucket(
+        self,
+        file_data: Union[str, bytes, BinaryIO],
+        object_name: str,
+        folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        full_object_name = _full_object_name(object_name, folder_path)
+        part_size = max(part_size or self.part_size, MIN_PART_SIZE)
+        concurrency = concurrency or self.concurrency
+        logger.info(f"Uploading to {self.bucket_name}/{full_object_name}")
+        try:
+            client = await self._get_client()
+            with ExitStack() as stack:
+                if isinstance(file_data, str):
+                    source = stack.enter_context(open(file_data, "rb"))
+                elif isinstance(file_data, (bytes, bytearray)):
+                    source = BytesIO(file_data)
+                else:
+                    source = file_data
+                # unknown lengths cannot be sent with a single PUT
+                remaining = _remaining(source)
+                if remaining < 0 or remaining > part_size:
+                    await self._multipart_upload(
+                        full_object_name, source, part_size, concurrency
+                    )
+                else:
+                    await client.put_object(
+                        Bucket=self.bucket_name, Key=full_object_name, Body=source
+                    )
+            logger.info(f"Upload successful: {full_object_name}")
+            return full_object_name, None
+        except Exception as e:
+            logger.error(f"Upload failed: {e}")
+            return None, Error(f"Error uploading file to {self.endpoint_url}: {e}")
+
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        folder_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Error]:
+        if not os.path.exists(file_path):
+            logger.warning(f"File not found: {file_path}")
+            return None, Error(f"File not found: {file_path}")
+        if object_name is None:
+            object_name = os.path.basename(file_path)
+        return await self.upload_to_bucket(file_path, object_name, folder_path)
+
+    async def upload_bytes(
+        self, data: bytes, object_name: str, folder_path: Optional[str] = None
+    ) -> Tuple[Optional[str], Error]:
+        return await self.upload_to_bucket(data, object_name, folder_path)
+
+    async def _ranged_download(
+        self,
+        key: str,
+        size: int,
+        destination: BinaryIO,
+        part_size: int,
+        concurrency: int,
+    ) -> None:
+        client = await self._get_client()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch(start: int) -> None:
+            end = min(start + part_size, size) - 1
+            async with slots:
+                response = await client.get_object(
+                    Bucket=self.bucket_name, Key=key, Range=f"bytes={start}-{end}"
+                )
+                stream = response["Body"]
+                async with stream:
+                    body = await stream.read()
+            # no await between seek and write, parts cannot interleave
+            destination.seek(start)
+            destination.write(body)
+
+        tasks = [
+            asyncio.create_task(fetch(start)) for start in range(0, size, part_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        destination.seek(size)
+
+    async def download_bytes(
+        self,
+        object_name: str,
+        destination: Union[str, BinaryIO],
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        part_size = part_size or self.part_size
+        concurrency = concurrency or self.concurrency
+        logger.info(f"Downloading object: {object_name}")
+        try:
+            client = await self._get_client()
+            head = await client.head_object(Bucket=self.bucket_name, Key=object_name)
+            size = head["ContentLength"]
+            with ExitStack() as stack:
+                if isinstance(destination, str):
+                    destination = stack.enter_context(open(destination, "wb"))
+                if size > part_size and destination.seekable():
+                    await self._ranged_download(
+                        object_name, size, destination, part_size, concurrency
+                    )
+                else:
+                    response = await client.get_object(
+                        Bucket=self.bucket_name, Key=object_name
+                    )
+                    stream = response["Body"]
+                    async with stream:
+                        async for chunk in stream.iter_chunks(DOWNLOAD_CHUNK):
+                            destination.write(chunk)
+            logger.info(f"Downloaded object: {object_name}")
+            return object_name, None
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return None, Error(f"Error downloading object: {str(e)}")
+
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = "GET",
+    ) -> Tuple[Optional[str], Error]:
+        logger.info(f"Generating presigned URL for: {key}")
+        try:
+            client = await self._get_client()
+            url = await client.generate_presigned_url(
+                PRESIGN_METHODS.get(http_method.upper(), "get_object"),
+                Params={"Bucket": self.bucket_name, "Key": key},
+                ExpiresIn=expiration,
+                HttpMethod=http_method,
+            )
+            return url, None
+        except Exception as e:
+            logger.error(f"Presigned URL generation failed: {e}")
+            return None, Error(f"Failed to generate presigned URL: {str(e)}")
+
+    async def generate_presigned_post(
+        self,
+        key: str,
+        max_size: int,
+        expiration: int = 3600,
+    ) -> Tuple[Optional[dict], Error]:
+        """
+        Sign a browser form upload of exactly key, at most max_size bytes.
+
+        Returns:
+            A ({"url": ..., "fields": {...}}, error) tuple, the fields are
+            posted as form data ahead of the file.
+        """
+        logger.info(f"Generating presigned POST for: {key}")
+        try:
+            client = await self._get_client()
+            post = await client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=key,
+                Conditions=[["content-length-range", 1, max_size]],
+                ExpiresIn=expiration,
+            )
+            return post, None
+        except Exception as e:
+            logger.error(f"Presigned POST generation failed: {e}")
+            return None, Error(f"Failed to generate presigned POST: {str(e)}")
+
+    async def get_object_size(self, key: str) -> Tuple[Optional[int], Error]:
+        try:
+            client = await self._get_client()
+            head = await client.head_object(Bucket=self.bucket_name, Key=key)
+            return head["ContentLength"], None
+        except Exception as e:
+            logger.error(f"Could not stat object {key}: {e}")
+            return None, Error(f"Object not found: {key}")
+
+
+class AsyncFilebaseStorage(AsyncS3Storage):
+    def __init__(
+        self, settings: FilebaseSettings, storage_settings: StorageSettings
+    ) -> None:
+        super().__init__(
+            settings.filebase_bucket_name,
+            endpoint_url=FILEBASE_ENDPOINT,
+            access_key=settings.filebase_access_key,
+            secret_key=settings.filebase_secret_access_key,
+            max_pool_connections=storage_settings.storage_max_pool_connections,
+            part_size=storage_settings.storage_part_size,
+            concurrency=storage_settings.storage_transfer_concurrency,
+        )
+
+
+class ThreadedStorage:
+    """
+    Run a blocking StorageProvider in worker threads.
+
+    Used for providers aiobotocore cannot sign for, IBM COS authenticates
+    with IAM tokens rather than S3 keys.
+    """
+
+    def __init__(self, provider: StorageProvider) -> None:
+        self._provider = provider
+
+    async def close(self) -> None:
+        return None
+
+    async def upload_to_bucket(
+        self,
+        file_data: Union[str, bytes, BinaryIO],
+        object_name: str,
+        folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        return await asyncio.to_thread(
+            self._provider.upload_to_bucket,
+            file_data,
+            object_name,
+            folder_path,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        folder_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Error]:
+        return await asyncio.to_thread(
+            self._provider.upload_file, file_path, object_name, folder_path
+        )
+
+    async def upload_bytes(
+        self, data: bytes, object_name: str, folder_path: Optional[str] = None
+    ) -> Tuple[Optional[str], Error]:
+        return await asyncio.to_thread(
+            self._provider.upload_bytes, data, object_name, folder_path
+        )
+
+    async def download_bytes(
+        self,
+        object_name: str,
+        destination: Union[str, BinaryIO],
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        return await asyncio.to_thread(
+            self._provider.download_bytes,
+            object_name,
+            destination,
+            part_size=part_size,
+            concurrency=concurrency,
+        )
+
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = "GET",
+    ) -> Tuple[Optional[str], Error]:
+        return await asyncio.to_thread(
+            self._provider.generate_presigned_url, key, expiration, http_method
+        )
+
+    async def generate_presigned_post(
+        self,
+        key: str,
+        max_size: int,
+        expiration: int = 3600,
+    ) -> Tuple[Optional[dict], Error]:
+        return None, Error("Presigned uploads are not supported by this provider")
+
+    async def get_object_size(self, key: str) -> Tuple[Optional[int], Error]:
+        return await asyncio.to_thread(self._provider.get_object_size, key)
+
+
+class LocalStorage:
+    """
+    AsyncStorageProvider backed by a directory, object names are paths
+    under root. Stand-in for a bucket in development and tests.
+    """
+
+    def __init__(self, root: Union[str, os.PathLike]) -> None:
+        self.root = Path(root)
+
+    def _path(self, object_name: str) -> Path:
+        path = (self.root / object_name).resolve()
+        if not path.is_relative_to(self.root.resolve()):
+            raise ValueError(f"Object name escapes storage root: {object_name}")
+        return path
+
+    async def close(self) -> None:
+        return None
+
+    async def upload_to_bucket(
+        self,
+        file_data: Union[str, bytes, BinaryIO],
+        object_name: str,
+        folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        # local copies are not split, part_size and concurrency are ignored
+        full_object_name = _full_object_name(object_name, folder_path)
+
+        def write() -> None:
+            path = self._path(full_object_name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if isinstance(file_data, str):
+                shutil.copyfile(file_data, path)
+                return
+            source = (
+                BytesIO(file_data)
+                if isinstance(file_data, (bytes, bytearray))
+                else file_data
+            )
+            with open(path, "wb") as file:
+                shutil.copyfileobj(source, file)
+
+        try:
+            await asyncio.to_thread(write)
+            return full_object_name, None
+        except Exception as e:
+            logger.error(f"Upload failed: {e}")
+            return None, Error(f"Error uploading file to {self.root}: {e}")
+
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        folder_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Error]:
+        if not os.path.exists(file_path):
+            return None, Error(f"File not found: {file_path}")
+        if object_name is None:
+            object_name = os.path.basename(file_path)
+        return await self.upload_to_bucket(file_path, object_name, folder_path)
+
+    async def upload_bytes(
+        self, data: bytes, object_name: str, folder_path: Optional[str] = None
+    ) -> Tuple[Optional[str], Error]:
+        return await self.upload_to_bucket(data, object_name, folder_path)
+
+    async def download_bytes(
+        self,
+        object_name: str,
+        destination: Union[str, BinaryIO],
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]:
+        def read() -> None:
+            path = self._path(object_name)
+            if isinstance(destination, str):
+                shutil.copyfile(path, destination)
+                return
+            with open(path, "rb") as file:
+                shutil.copyfileobj(file, destination)
+
+        try:
+            await asyncio.to_thread(read)
+            return object_name, None
+        except Exception as e:
+            logger.error(f"Download failed: {e}")
+            return None, Error(f"Error downloading object: {str(e)}")
+
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = "GET",
+    ) -> Tuple[Optional[str], Error]:
+        try:
+            return self._path(key).as_uri(), None
+        except ValueError as e:
+            return None, Error(str(e))
+
+    async def generate_presigned_post(
+        self,
+        key: str,
+        max_size: int,
+        expiration: int = 3600,
+    ) -> Tuple[Optional[dict], Error]:
+        return None, Error("Presigned uploads are not supported by local storage")
+
+    async def get_object_size(self, key: str) -> Tuple[Optional[int], Error]:
+        try:
+            return await asyncio.to_thread(os.path.getsize, self._path(key)), None
+        except (OSError, ValueError):
+            return None, Error(f"Object not found: {key}")
@@ -1,22 +1,100 @@
-from typing import Union
+import inspect
+import threading
+from typing import Optional, Union
 
+from sliderblend.internal.storage.async_storage import (
+    AsyncFilebaseStorage,
+    LocalStorage,
+    ThreadedStorage,
+)
 from sliderblend.internal.storage.filebase_storage import FilebaseStorage
 from sliderblend.internal.storage.ibm_storage import IBMStorage
-from sliderblend.pkg import FilebaseSettings, IBMSettings, get_logger
-from sliderblend.pkg.types import Error, StorageProvider, error
+from sliderblend.pkg import FilebaseSettings, IBMSettings, StorageSettings, get_logger
+from sliderblend.pkg.types import AsyncStorageProvider, Error, StorageProvider, error
 
 logger = get_logger(__name__)
 
+# one client per provider and settings for the life of the process, so
+# connection pools and resolved credentials are reused across jobs. Providers
+# are built while holding the lock so racing callers never create a second
+# client, reentrant because the threaded ibm provider builds a sync one
+_providers: dict[tuple, Union[StorageProvider, AsyncStorageProvider]] = {}
+_providers_lock = threading.RLock()
+
+
+def _registry_key(kind: str, provider: str, *settings) -> tuple:
+    return (
+        kind,
+        provider,
+        *(
+            (type(s).__name__, s.model_dump_json()) if s is not None else None
+            for s in settings
+        ),
+    )
+
 
 def get_storage_provider(
-    provider: str, settings: Union[IBMSettings, FilebaseSettings]
+    provider: str,
+    settings: Union[IBMSettings, FilebaseSettings],
+    storage_settings: Optional[StorageSettings] = None,
 ) -> tuple[StorageProvider, error]:
     provider = provider.lower()
-    logger.info("Creating storage bucket for %s", provider)
-    if provider == "ibm":
-        logger.info("Creating IBM storage")
-        return IBMStorage(settings), None
-    if provider == "filebase":
-        logger.info("Creating Filebase storage")
-        return FilebaseStorage(settings), None
-    return None, Error(f"Unsupported storage provider: {provider}")
+    key = _registry_key("sync", provider, settings, storage_settings)
+    with _providers_lock:
+        if key in _providers:
+            return _providers[key], None
+        logger.info("Creating storage bucket for %s", provider)
+        if provider == "ibm":
+            logger.info("Creating IBM storage")
+            instance = IBMStorage(settings, storage_settings)
+        elif provider == "filebase":
+            logger.info("Creating Filebase storage")
+            instance = FilebaseStorage(settings, storage_settings)
+        else:
+            return None, Error(f"Unsupported storage provider: {provider}")
+        _providers[key] = instance
+        return instance, None
+
+
+def get_async_storage_provider(
+    provider: str,
+    settings: Union[IBMSettings, FilebaseSettings, None] = None,
+    storage_settings: Optional[StorageSettings] = None,
+) -> tuple[AsyncStorageProvider, error]:
+    provider = provider.lower()
+    storage_settings = storage_settings or StorageSettings()
+    key = _registry_key("async", provider, settings, storage_settings)
+    with _providers_lock:
+        if key in _providers:
+            return _providers[key], None
+        logger.info("Creating async storage bucket for %s", provider)
+        if provider == "filebase":
+            instance = AsyncFilebaseStorage(settings, storage_settings)
+        elif provider == "ibm":
+            sync_provider, err = get_storage_provider(
+                provider, settings, storage_settings
+            )
+            if err:
+                return None, err
+            instance = ThreadedStorage(sync_provider)
+        elif provider == "local":
+            instance = LocalStorage(storage_settings.storage_local_root)
+        else:
+            return None, Error(f"Unsupported storage provider: {provider}")
+        _providers[key] = instance
+        return instance, None
+
+
+async def close_storage_providers() -> None:
+    """Close every cached provider, called once on shutdown."""
+    with _providers_lock:
+        providers = list(_providers.values())
+        _providers.clear()
+    for instance in providers:
+        try:
+            closed = instance.close()
+            if inspect.isawaitable(closed):
+                await closed
+        except Exception as e:
+            logger.error("Could not close storage provider, error: %s", e)
+    logger.info("Closed %d storage providers", len(providers))
@@ -5,9 +5,10 @@ from io import BytesIO
 from typing import TYPE_CHECKING, BinaryIO, Optional, Tuple, Union
 
 import ibm_boto3
+from ibm_boto3.s3.transfer import TransferConfig
 from ibm_botocore.client import ClientError, Config
 
-from sliderblend.pkg import get_logger
+from sliderblend.pkg import StorageSettings, get_logger
 from sliderblend.pkg.types import Error, error
 
 logger = get_logger(__name__)
@@ -31,11 +32,32 @@ def _create_client(credentials: IBMSettings) -> ServiceResource:
 
 
 class IBMStorage:
-    def __init__(self, settings: IBMSettings) -> None:
+    def __init__(
+        self,
+        settings: IBMSettings,
+        storage_settings: Optional[StorageSettings] = None,
+    ) -> None:
         logger.debug("Initializing IBMStorage class...")
         self.credentials = settings
+        self.storage_settings = storage_settings or StorageSettings()
         self._client = _create_client(self.credentials)
 
+    def close(self) -> None:
+        self._client.close()
+
+    def _transfer_config(
+        self, part_size: Optional[int], concurrency: Optional[int]
+    ) -> TransferConfig:
+        # objects over part_size are sent as concurrent multipart uploads and
+        # fetched with concurrent ranged GETs
+        part_size = part_size or self.storage_settings.storage_part_size
+        return TransferConfig(
+            multipart_threshold=part_size,
+            multipart_chunksize=part_size,
+            max_concurrency=concurrency
+            or self.storage_settings.storage_transfer_concurrency,
+        )
+
     def get_buckets(self):
         print("Retrieving list of buckets")
         try:
@@ -52,8 +74,12 @@ class IBMStorage:
         file_data: Union[str, bytes, BinaryIO],
         object_name: str,
         folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> Tuple[Optional[str], Error]:
         bucket_name = self.credentials.ibm_bucket_name
+        config = self._transfer_config(part_size, concurrency)
         print(self._client.list_objects(Bucket=bucket_name))
         if folder_path:
             folder_path = folder_path.strip("/")
@@ -67,12 +93,19 @@ class IBMStorage:
 
         try:
             if isinstance(file_data, str):
-                self._client.Object(bucket_name, full_object_name).upload_file(
-                    file_data
+                self._client.upload_file(
+                    file_data, bucket_name, full_object_name, Config=config
+                )
+            elif hasattr(file_data, "read"):
+                # file objects are streamed in parts, never read into memory
+                self._client.upload_fileobj(
+                    file_data, bucket_name, full_object_name, Config=config
                 )
             else:
                 file_obj = BytesIO(file_data)
-                self._client.upload_fileobj(file_obj, bucket_name, full_object_name)
+                self._client.upload_fileobj(
+                    file_obj, bucket_name, full_object_name, Config=config
+                )
 
             logger.info(f"Upload successful: {full_object_name}")
             return full_object_name, None
@@ -100,18 +133,41 @@ class IBMStorage:
     ) -> Tuple[Optional[str], Error]:
         return self.upload_to_bucket(data, object_name, folder_path)
 
-    def downloa_bytes(
+    def get_object_size(self, key: str) -> Tuple[Optional[int], Error]:
+        try:
+            head = self._client.head_object(
+                Bucket=self.credentials.ibm_bucket_name, Key=key
+            )
+            return head["ContentLength"], None
+        except Exception as e:
+            logger.error(f"Could not stat object {key}: {e}")
+            return None, Error(f"Object not found: {key}")
+
+    def download_bytes(
         self,
         object_name: str,
         destination: Union[str, BinaryIO] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> Tuple[Optional[str], Error]:
         logger.info(f"Downloading object: {object_name}")
+        config = self._transfer_config(part_size, concurrency)
         try:
-            self._client.download_fileobj(
-                Bucket=self.credentials.ibm_bucket_name,
-                Key=object_name,
-                Fileobj=destination,
-            )
+            if isinstance(destination, str):
+                self._client.download_file(
+                    self.credentials.ibm_bucket_name,
+                    object_name,
+                    destination,
+                    Config=config,
+                )
+            else:
+                self._client.download_fileobj(
+                    Bucket=self.credentials.ibm_bucket_name,
+                    Key=object_name,
+                    Fileobj=destination,
+                    Config=config,
+                )
             logger.info(f"Downloaded object: {object_name}")
             return f"<in-memory:{object_name}>", None
         except Exception as e:
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+
+from sliderblend.pkg import get_logger
+
+if TYPE_CHECKING:
+    from sliderblend.pkg.types import AsyncStorageProvider, error
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def spool_download(
+    storage_provider: AsyncStorageProvider,
+    object_name: str,
+    spool_dir: Optional[str] = None,
+) -> AsyncIterator[tuple[Optional[str], error]]:
+    """
+    Stream an object to a temp file and yield its path.
+
+    The object never sits in process memory, readers open the path and let
+    the page cache share it between jobs. The file is removed on exit.
+
+    Args:
+        storage_provider: provider the object is downloaded from.
+        object_name: key of the object in the bucket.
+        spool_dir: directory for the temp file, the system default if None.
+
+    Returns:
+        A (path, error) tuple, path is None when the download failed.
+    """
+    suffix = os.path.splitext(object_name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=spool_dir) as spool:
+        _, err = await storage_provider.download_bytes(object_name, spool)
+        if err:
+            yield None, err
+            return
+        spool.flush()
+        logger.debug("Spooled %s to %s", object_name, spool.name)
+        yield spool.name, None
@@ -2,45 +2,60 @@ from sliderblend.pkg.constants import (
     ALLOWED_EXTENSIONS,
     BASE_PROMPT,
     BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
     KB,
     MAX_FILE_SIZE,
     MB,
     NUMBER_OF_SLIDES,
+    PAGE_WINDOW,
 )
-from sliderblend.pkg.db import get_session
+from sliderblend.pkg.db import get_async_session, get_session
 from sliderblend.pkg.logger import get_logger
 from sliderblend.pkg.settings import (
     AppSecret,
+    ChunkSettings,
     ClientSettings,
     CohereSettings,
     DatabaseSettings,
+    EmbedderSettings,
     FilebaseSettings,
     IBMSettings,
     LLMSettings,
     RedisSettings,
+    SearchSettings,
+    StorageSettings,
     TelegramSettings,
     WebAppSettings,
+    WorkerSettings,
 )
 from sliderblend.pkg.types import PROCESS_STATE, Job
 
 __all__ = [
     "AppSecret",
+    "ChunkSettings",
     "FilebaseSettings",
     "ClientSettings",
     "DatabaseSettings",
+    "EmbedderSettings",
     "RedisSettings",
+    "StorageSettings",
+    "SearchSettings",
     "WebAppSettings",
+    "WorkerSettings",
     "IBMSettings",
     "CohereSettings",
     "LLMSettings",
     "TelegramSettings",
     "get_session",
+    "get_async_session",
     "get_logger",
     "MB",
     "MAX_FILE_SIZE",
     "KB",
     "ALLOWED_EXTENSIONS",
     "BATCH_SIZE",
+    "EMBEDDING_DIMENSIONS",
+    "PAGE_WINDOW",
     "NUMBER_OF_SLIDES",
     "BASE_PROMPT",
     "PROCESS_STATE",
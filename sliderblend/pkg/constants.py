@@ -1,6 +1,8 @@
 NUMBER_OF_SLIDES = 5
 BASE_PROMPT = "base_system_prompt"
 BATCH_SIZE = 96
+EMBEDDING_DIMENSIONS = 1024  # document_embeddings.embedding is vector(1024)
+PAGE_WINDOW = 20  # pages parsed, embedded and saved at a time
 MAX_FILE_SIZE = 10 * 1024**2  # megabytes
 ALLOWED_EXTENSIONS = {".pdf"}
 KB = 1024
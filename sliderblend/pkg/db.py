@@ -1,14 +1,26 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from sliderblend.pkg.settings import DatabaseSettings
 
 database = DatabaseSettings()
 engine = create_engine(
-    database.return_connction_string())  # echo=True logs SQL statements
+    database.return_connction_string(), **database.pool_options()
+)  # echo=True logs SQL statements
+async_engine = create_async_engine(
+    database.return_async_connection_string(), **database.pool_options()
+)
 
 
 def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
-        return session
+        yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    # objects stay usable after commit, endpoints return them once committed
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
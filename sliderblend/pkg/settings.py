@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Literal, Optional, Union
 
 from cohere.client_v2 import AsyncClientV2, ClientV2
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -11,8 +11,9 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from sliderblend.pkg.utils import return_base_dir
 
 if TYPE_CHECKING:
-    from sliderblend.internal import IBMStorage
+    from sliderblend.internal import IBMStorage, SessionCache
     from sliderblend.internal.redis import RedisClient, RedisJob
+    from sliderblend.pkg.types import AsyncStorageProvider, Embedder
 
 
 env_dir = os.path.join(return_base_dir(), ".env")
@@ -36,10 +37,26 @@ class DatabaseSettings(AppSettings):
     database_password: str
     database_username: str
     database_name: str
+    database_pool_size: int = 10  # connections kept open per engine
+    database_max_overflow: int = 20  # extra connections allowed under load
+    database_pool_recycle: int = 1800  # seconds before a connection is replaced
+    database_pool_timeout: int = 30  # seconds to wait for a free connection
 
     def return_connction_string(self) -> str:
         return f"postgresql+psycopg2://{self.database_username}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
 
+    def return_async_connection_string(self) -> str:
+        return f"postgresql+psycopg://{self.database_username}:{self.database_password}@{self.database_host}:{self.database_port}/{self.database_name}"
+
+    def pool_options(self) -> dict:
+        return {
+            "pool_size": self.database_pool_size,
+            "max_overflow": self.database_max_overflow,
+            "pool_recycle": self.database_pool_recycle,
+            "pool_timeout": self.database_pool_timeout,
+            "pool_pre_ping": True,
+        }
+
 
 class LLMSettings(AppSettings):
     llm_name: str
@@ -48,6 +65,31 @@ class LLMSettings(AppSettings):
 
 class CohereSettings(AppSettings):
     cohere_api_key: Optional[str] = None
+    cohere_max_concurrency: int = 4  # embed requests in flight per document
+    cohere_max_retries: int = 3
+    cohere_batch_tokens: int = 16384  # starting token budget per embed request
+    cohere_min_batch_tokens: int = 512
+    cohere_max_batch_tokens: int = 49152  # 96 texts of 512 tokens
+    cohere_target_latency: float = 2.0  # seconds, batches grow while under it
+    cohere_timeout: float = 60.0  # seconds per embed request
+
+
+class EmbedderSettings(AppSettings):
+    embedder_backend: Literal["cohere", "local", "fake"] = "cohere"
+    embedder_local_model: str = "BAAI/bge-large-en-v1.5"  # must be 1024 dims
+    embedder_local_backend: Literal["torch", "onnx", "openvino"] = "onnx"
+    embedder_local_device: str = "cpu"
+    embedder_local_workers: int = 1  # threads encoding batches in parallel
+    embedder_local_batch_size: int = 32
+    embedder_local_query_prompt: str = (
+        "Represent this sentence for searching relevant passages: "
+    )
+    embedder_fake_latency: float = 0.0  # seconds per call, for load tests
+    # how new documents are stored: float32 vector, float16 halfvec, cohere
+    # int8 in a halfvec or cohere binary in a bit column
+    embedder_storage: Literal["vector", "halfvec", "int8", "binary"] = "vector"
+    embedder_coalesce_delay: float = 0.005  # seconds to wait for other jobs, 0 disables
+    embedder_coalesce_max_concurrency: int = 8  # batches in flight per process
 
 
 class RedisSettings(AppSettings):
@@ -55,6 +97,8 @@ class RedisSettings(AppSettings):
     redis_host: str
     redis_username: str = ""
     redis_password: str
+    session_cache_size: int = 10000  # sessions kept in memory per worker
+    session_cache_ttl: int = 60  # seconds
 
 
 class IBMSettings(AppSettings):
@@ -70,10 +114,41 @@ class FilebaseSettings(AppSettings):
     filebase_secret_access_key: str
 
 
+class ChunkSettings(AppSettings):
+    chunk_max_tokens: int = 256  # capped at the embed model's 512 token limit
+    chunk_overlap_tokens: int = 32
+    chunk_tokenizer: Optional[str] = None  # tokenizer.json, word count if unset
+
+
+class SearchSettings(AppSettings):
+    search_top_k: int = 5  # chunks returned when k is not given
+    search_ef_search: int = 40  # hnsw candidate list, higher is slower but recalls more
+    search_exact_max_chunks: int = 5000  # documents this small skip hnsw
+    search_iterative_scan: Optional[str] = "relaxed_order"  # pgvector>=0.8, None to disable
+
+
+class StorageSettings(AppSettings):
+    storage_max_pool_connections: int = 20  # per async s3 client
+    storage_local_root: str = ".storage"  # bucket directory for the local provider
+    storage_part_size: int = 8 * 1024**2  # bytes, larger objects go multipart/ranged
+    storage_transfer_concurrency: int = 8  # parts in flight per transfer
+    storage_presign_expiration: int = 900  # seconds a presigned upload stays valid
+
+
 class TelegramSettings(AppSettings):
     telegram_bot_token: str
 
 
+class WorkerSettings(AppSettings):
+    worker_concurrency: int = 4  # jobs processed at the same time
+    worker_processes: Optional[int] = None  # parser processes, cpu count if unset
+    worker_page_shards: int = 1  # processes extracting one page window, 1 disables
+    worker_spool_dir: Optional[str] = None  # downloaded documents, tmp if unset
+    worker_poll_timeout: int = 5  # seconds
+    worker_visibility_timeout: int = 900  # seconds before a claimed job is retried
+    worker_max_deliveries: int = 3  # runs of a job before it is marked failed
+
+
 class AppSecret(AppSettings):
     app_secret: str
 
@@ -82,5 +157,8 @@ class AppSecret(AppSettings):
 class ClientSettings:
     REDIS_CLIENT: Optional[RedisClient] = None
     REDIS_JOB: Optional[RedisJob] = None
+    SESSION_CACHE: Optional[SessionCache] = None
     COHERE_CLIENT: Optional[Union[AsyncClientV2, ClientV2]] = None
+    EMBEDDER: Optional[Embedder] = None
     IBM_CLIENT: Optional[IBMStorage] = None
+    STORAGE_CLIENT: Optional[AsyncStorageProvider] = None
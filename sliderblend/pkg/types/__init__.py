@@ -1,6 +1,7 @@
-from sliderblend.pkg.types.base_types import (Error, FileUnit, StorageProvider,
+from sliderblend.pkg.types.base_types import (AsyncStorageProvider, Embedder,
+                                              Error, FileUnit, StorageProvider,
                                               error)
-from sliderblend.pkg.types.redis_types import PROCESS_STATE, Job
+from sliderblend.pkg.types.redis_types import PROCESS_STATE, Codec, Job
 from sliderblend.pkg.types.telegram_types import TelegramInitData, TelegramUser
 
 __all__ = [
@@ -9,7 +10,10 @@ __all__ = [
     "Error",
     "Job",
     "PROCESS_STATE",
+    "Codec",
     "TelegramUser",
     "TelegramInitData",
     "StorageProvider",
+    "AsyncStorageProvider",
+    "Embedder",
 ]
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import BinaryIO, Optional, Protocol, Tuple, Union
+from typing import BinaryIO, List, Optional, Protocol, Tuple, Union
 
 
 class Error(Exception):
@@ -22,6 +22,9 @@ class StorageProvider(Protocol):
         file_data: Union[str, bytes, BinaryIO],
         object_name: str,
         folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> Tuple[Optional[str], Error]: ...
 
     def upload_file(
@@ -42,6 +45,9 @@ class StorageProvider(Protocol):
         self,
         object_name: str,
         destination: Union[str, BinaryIO],
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> Tuple[Optional[bytes], Error]: ...
 
     def generate_presigned_url(
@@ -50,3 +56,72 @@ class StorageProvider(Protocol):
         expiration: int = 3600,
         http_method: str = "GET",
     ) -> Tuple[Optional[str], Error]: ...
+
+    def get_object_size(self, key: str) -> Tuple[Optional[int], Error]: ...
+
+    def close(self) -> None: ...
+
+
+class AsyncStorageProvider(Protocol):
+    async def upload_to_bucket(
+        self,
+        file_data: Union[str, bytes, BinaryIO],
+        object_name: str,
+        folder_path: Optional[str] = None,
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]: ...
+
+    async def upload_file(
+        self,
+        file_path: str,
+        object_name: Optional[str] = None,
+        folder_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Error]: ...
+
+    async def upload_bytes(
+        self,
+        data: bytes,
+        object_name: str,
+        folder_path: Optional[str] = None,
+    ) -> Tuple[Optional[str], Error]: ...
+
+    async def download_bytes(
+        self,
+        object_name: str,
+        destination: Union[str, BinaryIO],
+        *,
+        part_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> Tuple[Optional[str], Error]: ...
+
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = "GET",
+    ) -> Tuple[Optional[str], Error]: ...
+
+    async def generate_presigned_post(
+        self,
+        key: str,
+        max_size: int,
+        expiration: int = 3600,
+    ) -> Tuple[Optional[dict], Error]: ...
+
+    async def get_object_size(self, key: str) -> Tuple[Optional[int], Error]: ...
+
+    async def close(self) -> None: ...
+
+
+class Embedder(Protocol):
+    name: str  # model name, also namespaces the embedding cache
+    dimensions: int
+    embedding_type: str  # float, int8 or ubinary, what embed_documents returns
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]: ...
+
+    async def embed_query(self, text: str) -> List[float]: ...
+
+    async def close(self) -> None: ...
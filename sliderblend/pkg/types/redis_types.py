@@ -1,9 +1,18 @@
-from dataclasses import dataclass, field
+import json
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import StrEnum
-from typing import Dict
+from typing import Any, Dict, Protocol, Type, TypeVar
 from uuid import UUID, uuid4
 
+T = TypeVar("T")
+
+
+class Codec(Protocol):
+    def encode(self, data: Any) -> str: ...
+
+    def decode(self, data: str, object_class: Type[T] = None) -> T: ...
+
 
 class PROCESS_STATE(StrEnum):
     NOT_STARTED = "not_started"
@@ -15,11 +24,19 @@ class PROCESS_STATE(StrEnum):
 
 @dataclass
 class Job:
-    job_id: UUID = field(default_factory=uuid4, init=False)
-    process_state: PROCESS_STATE = field(default=PROCESS_STATE.NOT_STARTED, init=False)
+    job_id: UUID = field(default_factory=uuid4)
+    process_state: PROCESS_STATE = field(default=PROCESS_STATE.NOT_STARTED)
     metadata: Dict[str, any] = field(default=None)
-    is_complete: bool = field(default=False, init=False)
-    _date_published: datetime = field(default_factory=datetime.now, init=False)
+    is_complete: bool = field(default=False)
+    _date_published: datetime = field(default_factory=datetime.now)
+
+    def __post_init__(self) -> None:
+        # jobs read back from redis carry plain json values
+        if isinstance(self.job_id, str):
+            self.job_id = UUID(self.job_id)
+        if isinstance(self._date_published, str):
+            self._date_published = datetime.fromisoformat(self._date_published)
+        self.process_state = PROCESS_STATE(self.process_state)
 
     @property
     def date_published(self) -> str:
@@ -28,5 +45,8 @@ class Job:
     def dict(self) -> None:
         return self.__dict__
 
+    def model_dump_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
     def completed(self) -> None:
         self.is_complete = True
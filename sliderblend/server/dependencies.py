@@ -3,16 +3,16 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from fastapi import Depends, HTTPException, Request, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from sliderblend.internal.models import UserModel
 from sliderblend.internal.schemas import BotRequestSchema, UserCache
-from sliderblend.pkg import AppSecret, ClientSettings, get_logger, get_session
+from sliderblend.pkg import AppSecret, ClientSettings, get_async_session, get_logger
 from sliderblend.pkg.types import Error
 from sliderblend.pkg.utils import verifiy_payload
 
 if TYPE_CHECKING:
-    from sliderblend.internal import RedisClient
+    from sliderblend.internal import RedisClient, SessionCache
 
 logger = get_logger(__name__)
 app_secret = AppSecret()
@@ -60,27 +60,39 @@ def get_redis_job(clients: ClientSettings = Depends(get_clients)):
     return clients.REDIS_JOB
 
 
+def get_session_cache(clients: ClientSettings = Depends(get_clients)):
+    return clients.SESSION_CACHE
+
+
 def get_cohere(clients: ClientSettings = Depends(get_clients)):
     return clients.COHERE_CLIENT
 
 
+def get_embedder(clients: ClientSettings = Depends(get_clients)):
+    return clients.EMBEDDER
+
+
 def get_ibm(clients: ClientSettings = Depends(get_clients)):
     return clients.IBM_CLIENT
 
 
+def get_storage(clients: ClientSettings = Depends(get_clients)):
+    return clients.STORAGE_CLIENT
+
+
 def get_client_session(request: Request, key: ReqSession = Depends()) -> ReqSession:
     return key(request)
 
 
 async def get_current_user(
     session_key: str = Depends(get_client_session),
-    redis_client: RedisClient = Depends(get_redis),
+    session_cache: SessionCache = Depends(get_session_cache),
 ) -> UserCache:
     if not session_key:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Session Not found"
         )
-    user, err = await redis_client.get(session_key, UserCache)
+    user, err = await session_cache.get(session_key, UserCache)
     if err:
         logger.error(err.message)
         raise HTTPException(
@@ -105,7 +117,7 @@ async def veifiy_bot_request(
 async def get_bot_req_user(
     user: BotRequestSchema = Depends(veifiy_bot_request),
     redis_cache: RedisClient = Depends(get_redis),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
 ) -> UserCache:
     cache_key = f"user:{user.user_telegram_id}"
 
@@ -117,7 +129,7 @@ async def get_bot_req_user(
 
     # Fallback to DB
     logger.info(f"User {user} not found in cache. Querying database...")
-    user, err = UserModel.get(
+    user, err = await UserModel.aget(
         field="telegram_user_id", value=user.user_telegram_id, session=session
     )
     if err:
@@ -1,7 +1,8 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from uuid import UUID
 
-from fastapi import BackgroundTasks, Depends, FastAPI, Request, UploadFile, status
+from fastapi import Depends, FastAPI, Request, UploadFile, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
 from sqlmodel import Session
@@ -10,7 +11,7 @@ from starlette.middleware import Middleware
 from sliderblend.internal import init_clients
 from sliderblend.internal.entities import create_document
 from sliderblend.internal.schemas import CreateDocumentSchema, UserCache
-from sliderblend.internal.services import start_chunkning_process
+from sliderblend.internal.storage import close_storage_providers
 from sliderblend.pkg import (
     ClientSettings,
     TelegramSettings,
@@ -19,6 +20,7 @@ from sliderblend.pkg import (
     get_session,
 )
 from sliderblend.pkg.constants import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from sliderblend.pkg.db import async_engine
 from sliderblend.pkg.types import PROCESS_STATE, Error, Job
 from sliderblend.pkg.utils import PageContext, get_templates
 from sliderblend.server.dependencies import (
@@ -27,7 +29,13 @@ from sliderblend.server.dependencies import (
     get_current_user,
 )
 from sliderblend.server.middlewares import RequestLoggerMiddleware
-from sliderblend.server.routers import AuthRouter, BotRouter, UserRouter
+from sliderblend.server.routers import (
+    AuthRouter,
+    BotRouter,
+    SearchRouter,
+    UploadRouter,
+    UserRouter,
+)
 
 telegram_settings = TelegramSettings()
 app_settings = WebAppSettings()
@@ -43,6 +51,8 @@ auth_router = AuthRouter(
 )
 user_router = UserRouter()
 bot_router = BotRouter()
+upload_router = UploadRouter()
+search_router = SearchRouter()
 
 
 @asynccontextmanager
@@ -50,11 +60,18 @@ async def lifespan(a: FastAPI):
     # Initialize all clients at startup
     clients = await init_clients()
     a.state.clients = clients
+    session_listener = asyncio.create_task(clients.SESSION_CACHE.listen())
     logger.info("Service initialization complete")
 
     yield  # App runs here
 
     # Cleanup resources at shutdown
+    session_listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await session_listener
+    await close_storage_providers()
+    await clients.EMBEDDER.close()
+    await async_engine.dispose()
     # await clients.REDIS_CLIENT.close()
     # await clients.COHERE_CLIENT.close()
     # logger.info("Services shut down gracefully")
@@ -80,7 +97,6 @@ async def home(request: Request) -> HTMLResponse:
 async def create_process(
     request: Request,
     document: UploadFile,
-    background_tasks: BackgroundTasks,
     user: UserCache = Depends(get_current_user),
     session: Session = Depends(get_session),
     clients: ClientSettings = Depends(get_clients),
@@ -89,7 +105,6 @@ async def create_process(
     process ID."""
     logger.info("Document received")
     # TODO get the user so we can store in the db
-    file_contents = await document.read()
     logger.info("Checking document type")
     if not any(document.filename.lower().endswith(ext) for ext in ALLOWED_EXTENSIONS):
         err = Error("Unsupported file type")
@@ -110,8 +125,11 @@ async def create_process(
         )
     logger.info("Uploading document to store")
     document_name = f"{user.telegram_username}/{document.filename}"
-    file_key, err = clients.IBM_CLIENT.upload_bytes(
-        data=file_contents, object_name=document_name
+    # the upload is already spooled to disk by starlette, stream it from there
+    # instead of reading it into memory
+    await document.seek(0)
+    file_key, err = await clients.STORAGE_CLIENT.upload_to_bucket(
+        document.file, document_name
     )
     if err:
         logger.error("Error uploading %s to bucket, ERROR: %s", job.job_id, err.message)
@@ -138,8 +156,15 @@ async def create_process(
             {"error": "One minute we need bigger servers :)", "request": request},
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
-    background_tasks.add_task(start_chunkning_process, clients, job.job_id)
-    logger.info("Created background process for: %s", job.job_id)
+    err = await clients.REDIS_JOB.enqueue_job(job)
+    if err:
+        logger.error("Error queueing job %s ERROR: %s", job.job_id, err.message)
+        return html_templates.TemplateResponse(
+            "partials/upload_error.html",
+            {"error": "One minute we need bigger servers :)", "request": request},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    logger.info("Queued job %s", job.job_id)
 
     logger.info("Success uploading %s to bucket", job.job_id)
     return {"process_id": str(job.job_id)}  # Return process ID
@@ -159,6 +184,8 @@ def get_process_status(process_id: UUID):
 app.include_router(auth_router.get_router())
 app.include_router(user_router.get_router())
 app.include_router(bot_router.get_router())
+app.include_router(upload_router.get_router())
+app.include_router(search_router.get_router())
 
 # TODO add telegram middleware
 # TODO why cores, seems like I have forgotten again
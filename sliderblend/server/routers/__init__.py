@@ -1,6 +1,8 @@
 from sliderblend.server.routers.authRouter import AuthRouter
 from sliderblend.server.routers.botRouter import BotRouter
 from sliderblend.server.routers.genRouter import GenRouter
+from sliderblend.server.routers.searchRouter import SearchRouter
+from sliderblend.server.routers.uploadRouter import UploadRouter
 from sliderblend.server.routers.userRouter import UserRouter
 
-__all__ = ["AuthRouter", "GenRouter", "UserRouter", "BotRouter"]
+__all__ = ["AuthRouter", "GenRouter", "UserRouter", "BotRouter", "UploadRouter", "SearchRouter"]
@@ -9,12 +9,12 @@ from sliderblend.internal.models import UserModel
 from sliderblend.internal.schemas import UserCache
 from sliderblend.pkg import get_logger, get_session
 from sliderblend.pkg.utils import generate_session_key, verify_tg_init_data
-from sliderblend.server.dependencies import get_redis
+from sliderblend.server.dependencies import get_session_cache
 
 if TYPE_CHECKING:
     from sqlmodel import Session
 
-    from sliderblend.internal import RedisClient
+    from sliderblend.internal import SessionCache
     from sliderblend.pkg import TelegramSettings
 
 
@@ -38,7 +38,7 @@ class AuthRouter:
     async def callback_url(
         self,
         data: dict,
-        redis_client: RedisClient = Depends(get_redis),
+        session_cache: SessionCache = Depends(get_session_cache),
         session: Session = Depends(get_session),
     ):
         logger.info("Received callback request with data")
@@ -89,7 +89,8 @@ class AuthRouter:
         session_key = generate_session_key(user.id)
         logger.debug("Generated session key")
 
-        err = await redis_client.create(
+        # through the session cache so every worker drops a stale copy
+        err = await session_cache.set(
             f"user:{session_key}", UserCache(**user.model_dump())
         )
         if err:
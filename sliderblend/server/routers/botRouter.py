@@ -2,18 +2,17 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import JSONResponse
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from sliderblend.internal.entities import create_document
+from sliderblend.internal.entities import acreate_document
 from sliderblend.internal.schemas import (
     BotChunkRequestSchema,
     CreateDocumentSchema,
     UserCache,
 )
-from sliderblend.internal.services import start_chunkning_process
-from sliderblend.pkg import get_session
+from sliderblend.pkg import get_async_session
 from sliderblend.pkg.logger import get_logger
 from sliderblend.pkg.types import FileUnit, Job
 from sliderblend.server.dependencies import get_bot_req_user, get_redis_job
@@ -34,9 +33,8 @@ class BotRouter:
         self,
         request: Request,
         payload: BotChunkRequestSchema,
-        background_tasks: BackgroundTasks,
         user: UserCache = Depends(get_bot_req_user),
-        session: Session = Depends(get_session),
+        session: AsyncSession = Depends(get_async_session),
         redis_job: RedisJob = Depends(get_redis_job),
     ):
         doc_schema = CreateDocumentSchema(
@@ -45,7 +43,7 @@ class BotRouter:
             size=payload.size,
             number_of_pages=payload.number_of_pages,
         )
-        document, err = create_document(doc_schema, session)
+        document, err = await acreate_document(doc_schema, session)
         if err:
             logger.error(err.message)
             return JSONResponse(
@@ -67,7 +65,13 @@ class BotRouter:
                 {"error": "One minute we need bigger servers :)", "request": request},
             )
 
-        background_tasks.add_task(start_chunkning_process, "filebase", job)
-        logger.info("Created background process for: %s", job.job_id)
-        session.commit()
+        # commit before queueing so the worker can see the document
+        await session.commit()
+        err = await redis_job.enqueue_job(job)
+        if err:
+            logger.error("Could not queue job %s, error: %s", job.job_id, err.message)
+            return JSONResponse(
+                err.message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        logger.info("Queued job %s", job.job_id)
         return {"process_id": str(job.job_id)}  # Return process ID
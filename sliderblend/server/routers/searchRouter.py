@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from sliderblend.internal.models import DocumentsModel
+from sliderblend.internal.schemas import SearchRequestSchema, UserCache
+from sliderblend.internal.services.search import search
+from sliderblend.pkg import get_async_session, get_logger
+from sliderblend.server.dependencies import get_current_user, get_embedder
+
+if TYPE_CHECKING:
+    from sliderblend.pkg.types import Embedder
+
+PREFIX = "/search"
+logger = get_logger(__name__)
+
+
+class SearchRouter:
+    def get_router(self):
+        router = APIRouter(prefix=PREFIX)
+        router.add_api_route("", self.search_document, methods=["POST"])
+        return router
+
+    async def search_document(
+        self,
+        payload: SearchRequestSchema,
+        user: UserCache = Depends(get_current_user),
+        session: AsyncSession = Depends(get_async_session),
+        embedder: Embedder = Depends(get_embedder),
+    ):
+        document, err = await DocumentsModel.aget(
+            value=payload.document_id, session=session
+        )
+        if err or document.user_id != user.id:
+            return JSONResponse(
+                "Document not found", status_code=status.HTTP_404_NOT_FOUND
+            )
+        results, err = await search(
+            embedder,
+            document_id=payload.document_id,
+            query=payload.query,
+            k=payload.k,
+            session=session,
+            ef_search=payload.ef_search,
+        )
+        if err:
+            logger.error("Search failed for %s, error: %s", payload.document_id, err)
+            return JSONResponse(
+                "Could not search document",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return [result.model_dump(mode="json") for result in results]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import JSONResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from sliderblend.internal.entities import acreate_document
+from sliderblend.internal.schemas import (
+    CreateDocumentSchema,
+    PendingUpload,
+    UploadCompleteSchema,
+    UploadUrlRequestSchema,
+    UserCache,
+)
+from sliderblend.pkg import StorageSettings, get_async_session, get_logger
+from sliderblend.pkg.constants import ALLOWED_EXTENSIONS, MAX_FILE_SIZE
+from sliderblend.pkg.types import Job
+from sliderblend.pkg.utils import sanitize_filename
+from sliderblend.server.dependencies import (
+    get_current_user,
+    get_redis,
+    get_redis_job,
+    get_storage,
+)
+
+if TYPE_CHECKING:
+    from sliderblend.internal import RedisClient, RedisJob
+    from sliderblend.pkg.types import AsyncStorageProvider
+
+PREFIX = "/upload"
+UPLOAD_PREFIX = "upload:"
+DOCUMENTS_FOLDER = "documents"  # the worker reads documents/<file_key>
+
+logger = get_logger(__name__)
+storage_settings = StorageSettings()
+
+
+class UploadRouter:
+    """
+    Direct to bucket uploads. The browser asks for a presigned POST, sends
+    the file straight to object storage, then calls /complete to queue the
+    embedding job, so document bytes never pass through the API.
+    """
+
+    def get_router(self):
+        router = APIRouter(prefix=PREFIX)
+        router.add_api_route("/url", self.create_upload_url, methods=["POST"])
+        router.add_api_route("/complete", self.complete_upload, methods=["POST"])
+        return router
+
+    async def create_upload_url(
+        self,
+        payload: UploadUrlRequestSchema,
+        user: UserCache = Depends(get_current_user),
+        redis_client: RedisClient = Depends(get_redis),
+        storage: AsyncStorageProvider = Depends(get_storage),
+    ):
+        if os.path.splitext(payload.filename.lower())[1] not in ALLOWED_EXTENSIONS:
+            return JSONResponse(
+                "Unsupported file type",
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        if payload.size > MAX_FILE_SIZE:
+            return JSONResponse(
+                "File too large", status_code=status.HTTP_406_NOT_ACCEPTABLE
+            )
+
+        upload_id = uuid4()
+        file_key = f"{user.id}/{upload_id.hex}-{sanitize_filename(payload.filename)}"
+        pending = PendingUpload(
+            upload_id=upload_id,
+            user_id=user.id,
+            file_key=file_key,
+            object_key=f"{DOCUMENTS_FOLDER}/{file_key}",
+        )
+        post, err = await storage.generate_presigned_post(
+            pending.object_key,
+            max_size=MAX_FILE_SIZE,
+            expiration=storage_settings.storage_presign_expiration,
+        )
+        if err:
+            logger.error("Could not presign upload, error: %s", err.message)
+            return JSONResponse(
+                "Could not create upload",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        err = await redis_client.create(f"{UPLOAD_PREFIX}{upload_id}", pending)
+        if err:
+            logger.error("Could not save upload %s, error: %s", upload_id, err.message)
+            return JSONResponse(
+                "Could not create upload",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        logger.info("Created upload %s for %s", upload_id, user.id)
+        return {
+            "upload_id": str(upload_id),
+            "url": post["url"],
+            "fields": post["fields"],
+            "expires_in": storage_settings.storage_presign_expiration,
+        }
+
+    async def complete_upload(
+        self,
+        payload: UploadCompleteSchema,
+        user: UserCache = Depends(get_current_user),
+        session: AsyncSession = Depends(get_async_session),
+        redis_client: RedisClient = Depends(get_redis),
+        redis_job: RedisJob = Depends(get_redis_job),
+        storage: AsyncStorageProvider = Depends(get_storage),
+    ):
+        # taking the pending upload out of redis claims it, a concurrent or
+        # retried call for the same upload finds nothing
+        key = f"{UPLOAD_PREFIX}{payload.upload_id}"
+        pending, err = await redis_client.pop(key, PendingUpload)
+        if err:
+            return JSONResponse(
+                "Upload not found", status_code=status.HTTP_404_NOT_FOUND
+            )
+        committed = False
+        try:
+            if pending.user_id != user.id:
+                return JSONResponse(
+                    "Upload not found", status_code=status.HTTP_404_NOT_FOUND
+                )
+
+            # the bucket enforced the size on upload, this only confirms it landed
+            size, err = await storage.get_object_size(pending.object_key)
+            if err:
+                return JSONResponse(
+                    "Document has not been uploaded",
+                    status_code=status.HTTP_409_CONFLICT,
+                )
+
+            doc_schema = CreateDocumentSchema(
+                user_id=user.id,
+                document_name=pending.file_key,
+                size=size,
+                number_of_pages=payload.number_of_pages,
+            )
+            document, err = await acreate_document(doc_schema, session)
+            if err:
+                logger.error(err.message)
+                return JSONResponse(
+                    "Could not create document",
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+            job = Job(
+                metadata={
+                    "document_id": document.id,
+                    "file_key": document.document_name,
+                }
+            )
+            job, err = await redis_job.create_job(job)
+            if err:
+                logger.error("Could not create job, error: %s", err.message)
+                return JSONResponse(
+                    err.message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            # commit before queueing so the worker can see the document
+            await session.commit()
+            committed = True
+        finally:
+            if not committed:
+                # nothing was saved, let the client complete the upload again
+                err = await redis_client.create(key, pending)
+                if err:
+                    logger.error(
+                        "Could not restore upload %s, error: %s",
+                        payload.upload_id,
+                        err.message,
+                    )
+
+        err = await redis_job.enqueue_job(job)
+        if err:
+            # the document is saved, restoring the upload would let a retry
+            # create a second one
+            logger.error("Could not queue job %s, error: %s", job.job_id, err.message)
+            return JSONResponse(
+                err.message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        logger.info("Queued job %s for upload %s", job.job_id, payload.upload_id)
+        return {"process_id": str(job.job_id)}
@@ -0,0 +1,3 @@
+from sliderblend.worker.worker import run_worker
+
+__all__ = ["run_worker"]
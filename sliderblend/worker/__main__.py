@@ -0,0 +1,6 @@
+import asyncio
+
+from sliderblend.worker.worker import main
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+Embedding worker, consumes the jobs queued by the API.
+
+    python -m sliderblend.worker
+
+Any number of workers can run against the same Redis, each is a consumer in
+the job stream's consumer group. Jobs left unacked by a crashed worker are
+reclaimed once they have been pending longer than the visibility timeout,
+running jobs are kept claimed by a heartbeat well inside that timeout. A job
+delivered more than worker_max_deliveries times is marked failed.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import suppress
+
+from sliderblend.internal.services import start_chunkning_process
+from sliderblend.internal.services.main import embedder, redis_job
+from sliderblend.internal.storage import close_storage_providers
+from sliderblend.pkg import WorkerSettings, get_logger
+from sliderblend.pkg.types import Job
+
+logger = get_logger(__name__)
+
+
+async def _heartbeat(consumer: str, message_id: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await redis_job.touch_job(consumer, message_id)
+        except Exception as e:
+            logger.warning("Could not refresh job %s, error: %s", message_id, e)
+
+
+async def _process(
+    settings: WorkerSettings,
+    consumer: str,
+    message_id: str,
+    job: Job,
+    executor: Executor,
+    slots: asyncio.Semaphore,
+) -> None:
+    heartbeat = asyncio.create_task(
+        _heartbeat(consumer, message_id, settings.worker_visibility_timeout / 3)
+    )
+    try:
+        err = await start_chunkning_process("filebase", job, executor)
+        if err:
+            # left pending, reclaimed by a worker once the visibility
+            # timeout passes
+            logger.error("Job %s will be retried, error: %s", job.job_id, err)
+        else:
+            await redis_job.ack_job(message_id)
+    finally:
+        heartbeat.cancel()
+        with suppress(asyncio.CancelledError):
+            await heartbeat
+        slots.release()
+
+
+async def _next_job(
+    settings: WorkerSettings, consumer: str, reclaim: bool
+) -> list[tuple[str, Job]]:
+    if reclaim:
+        claimed = await redis_job.reclaim_stale_jobs(
+            consumer,
+            settings.worker_visibility_timeout * 1000,
+            max_deliveries=settings.worker_max_deliveries,
+        )
+        if claimed:
+            logger.info("Reclaimed stale job %s", claimed[0][1].job_id)
+            return claimed
+    return await redis_job.claim_jobs(
+        consumer, block=settings.worker_poll_timeout * 1000
+    )
+
+
+async def run_worker(settings: WorkerSettings, stop: asyncio.Event) -> None:
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+    slots = asyncio.Semaphore(settings.worker_concurrency)
+    running: set[asyncio.Task] = set()
+    last_reclaim = 0.0
+
+    with ProcessPoolExecutor(settings.worker_processes) as executor:
+        while not stop.is_set():
+            # only take a job off the queue when there is a slot to run it
+            await slots.acquire()
+            reclaim = time.monotonic() - last_reclaim > settings.worker_poll_timeout
+            if reclaim:
+                last_reclaim = time.monotonic()
+            try:
+                claimed = await _next_job(settings, consumer, reclaim)
+            except Exception as e:
+                logger.error("Could not fetch job, error: %s", e)
+                claimed = []
+            if not claimed:
+                slots.release()
+                continue
+
+            message_id, job = claimed[0]
+            logger.info("Picked up job %s", job.job_id)
+            task = asyncio.create_task(
+                _process(settings, consumer, message_id, job, executor, slots)
+            )
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        logger.info("Waiting for %d running jobs", len(running))
+        await asyncio.gather(*running, return_exceptions=True)
+    await close_storage_providers()
+    await embedder.close()
+
+
+async def main() -> None:
+    settings = WorkerSettings()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Starting worker, %d concurrent jobs", settings.worker_concurrency)
+    await run_worker(settings, stop)
+    logger.info("Stopped worker")